@@ -1,13 +1,19 @@
 from typing import Any, Dict, List, Optional
 
+from agents.telemetry import RunTelemetry
+
 
 class BaseAgent:
     name = "base"
 
+    def __init__(self) -> None:
+        self.telemetry = RunTelemetry()
+
     def run(
         self,
         source_ids: Optional[List[str]] = None,
         force_full_scan: bool = False,
         run_decay: bool = False,
+        claim_ids: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         raise NotImplementedError
@@ -1,31 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Any, Dict, List, Optional, Set, Tuple
 
-from qdrant_client.http import models
-
 from agents.base_agent import BaseAgent
 from agents.utils import (
     CONTRADICTION_THRESHOLD,
     CONTRADICTION_WINDOW_DAYS,
-    TREND_WINDOW_DAYS,
+    TREND_WINDOWS,
     VOLATILITY_ALERT_THRESHOLD,
     VOLATILITY_WINDOW_DAYS,
     chunk_list,
     compute_alert_level,
     contradiction_ratio,
     cutoff_days,
-    is_within_days,
     safe_float,
     safe_int,
     volatility_score,
 )
-from core.utils import now_iso
+from core.config import settings
+from core.utils import now_epoch, now_iso, uniq_list
 from memory.decay import apply_decay
-from memory.events import log_event
-from models.stance_classifier import classify_stance
-from qdrant_store.client import get_client
-from qdrant_store.collections import CLAIMS_COLLECTION, EVIDENCE_COLLECTION, MEDIA_COLLECTION
-from qdrant_store.crud import get_point, update_payload
-from storage.sqlite import get_connection
+from memory.events import EventRow, count_events_by_claim, log_event, log_events
+from memory.evidence import count_evidence_stances
+from qdrant_store.collections import CLAIMS_COLLECTION, MEDIA_COLLECTION
+from qdrant_store.crud import get_points, update_payloads
+from storage.claim_links import mention_counts
+from storage.claim_state import upsert_claim_states
+from storage.sqlite import read_connection
+
+
+CLAIM_FETCH_BATCH_SIZE = 100
+
+SUMMARY_KEYS = (
+    "claims_processed",
+    "claims_updated",
+    "claims_disputed",
+    "high_alerts",
+    "medium_alerts",
+    "volatility_flags",
+    "claims_deferred",
+)
+
+AGENT_CLAIM_FIELDS = [
+    "linked_media_ids",
+    "trend_score",
+    "contradiction_ratio",
+    "volatility_score",
+    "alert_level",
+    "status",
+]
 
 
 class ClaimEvolutionAgent(BaseAgent):
@@ -36,216 +59,232 @@ class ClaimEvolutionAgent(BaseAgent):
         source_ids: Optional[List[str]] = None,
         force_full_scan: bool = False,
         run_decay: bool = False,
+        claim_ids: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        summary = {
-            "claims_processed": 0,
-            "claims_updated": 0,
-            "claims_disputed": 0,
-            "high_alerts": 0,
-            "medium_alerts": 0,
-            "volatility_flags": 0,
-        }
+        summary = dict.fromkeys(SUMMARY_KEYS, 0)
 
         if run_decay:
-            updated = apply_decay()
-            log_event(
-                "system",
-                "agent_decay_run",
-                float(updated),
-                f"decay applied to {updated} claims",
-                agent_name=self.name,
-            )
+            self.run_decay_pass()
 
-        claim_ids = self._fetch_claim_ids(source_ids or [], force_full_scan)
+        telemetry = self.telemetry
+        if claim_ids is None:
+            with telemetry.phase("sqlite_claim_ids"):
+                claim_ids = self._fetch_claim_ids(source_ids or [], force_full_scan)
+        claim_ids = sorted(set(claim_ids))
         if not claim_ids:
             return summary
 
-        trend_counts = self._fetch_trend_counts(claim_ids)
-        conn = get_connection()
+        with telemetry.phase("sqlite_trend_counts"):
+            trend_counts = self._fetch_trend_counts(claim_ids)
+        with telemetry.phase("sqlite_volatility_counts"):
+            volatility_counts = self._fetch_volatility_counts(claim_ids)
+        telemetry.count("sqlite_queries", 2)
+
+        # Shards are fixed-size slices of the sorted ids, so the per-claim results
+        # do not depend on how many workers process them.
+        shards = chunk_list(claim_ids, size=CLAIM_FETCH_BATCH_SIZE)
+        process = partial(
+            self._process_shard,
+            trend_counts=trend_counts,
+            volatility_counts=volatility_counts,
+        )
+        workers = max(1, min(settings.agent_workers, len(shards)))
+        if workers == 1:
+            shard_summaries = [process(shard) for shard in shards]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=self.name) as pool:
+                shard_summaries = list(pool.map(process, shards))
+
+        for shard_summary in shard_summaries:
+            for key, value in shard_summary.items():
+                summary[key] += value
+        return summary
+
+    def run_decay_pass(self) -> int:
+        with self.telemetry.phase("decay"):
+            updated = apply_decay()
+        log_event(
+            "system",
+            "agent_decay_run",
+            float(updated),
+            f"decay applied to {updated} claims",
+            agent_name=self.name,
+        )
+        return updated
 
+    def _process_shard(
+        self,
+        claim_ids: List[str],
+        trend_counts: Dict[str, Dict[str, int]],
+        volatility_counts: Dict[str, int],
+    ) -> Dict[str, int]:
+        telemetry = self.telemetry
+        summary = dict.fromkeys(SUMMARY_KEYS, 0)
+        with telemetry.phase("qdrant_claim_fetch"):
+            points = get_points(CLAIMS_COLLECTION, claim_ids, payload_fields=AGENT_CLAIM_FIELDS)
+        telemetry.count("qdrant_requests")
+        payloads = {str(point.id): point.payload for point in points if point.payload}
+        with telemetry.phase("qdrant_media_fetch"):
+            media_phashes = self._fetch_media_phashes(points)
+
+        updates: Dict[str, Dict[str, Any]] = {}
+        events: List[EventRow] = []
         for claim_id in claim_ids:
-            point = get_point(CLAIMS_COLLECTION, claim_id)
-            if not point or not point.payload:
+            payload = payloads.get(claim_id)
+            if not payload:
                 continue
-            payload = point.payload
-
-            trend_score = float(trend_counts.get(claim_id, 0))
-            support_recent, contradict_recent = self._evidence_stance_counts(
-                claim_id, payload.get("claim_text", "")
+            updates[claim_id] = self._process_claim(
+                claim_id,
+                payload,
+                trend_counts,
+                volatility_counts,
+                media_phashes,
+                events,
+                summary,
             )
-            ratio = contradiction_ratio(support_recent, contradict_recent)
-            meme_variants = self._meme_variant_count(payload.get("linked_media_ids", []))
-            vol_events = self._confidence_event_count(conn, claim_id)
-            vol_score = volatility_score(vol_events)
-            alert_level = compute_alert_level(trend_score, ratio, vol_score)
-
-            updates: Dict[str, Any] = {
-                "trend_score": trend_score,
-                "contradiction_ratio": ratio,
-                "meme_variant_count": meme_variants,
-                "volatility_score": vol_score,
-                "alert_level": alert_level,
-                "last_agent_update_ts": now_iso(),
-            }
-
-            previous_trend = safe_float(payload.get("trend_score"))
-            if trend_score > previous_trend:
-                log_event(
-                    claim_id,
-                    "agent_reinforce",
-                    trend_score - previous_trend,
-                    f"trend window mentions={trend_score}",
-                    agent_name=self.name,
-                )
-
-            previous_ratio = safe_float(payload.get("contradiction_ratio"))
-            if abs(ratio - previous_ratio) >= 0.1:
-                log_event(
-                    claim_id,
-                    "agent_contradict_shift",
-                    ratio - previous_ratio,
-                    f"support={support_recent} contradict={contradict_recent}",
-                    agent_name=self.name,
-                )
-
-            if ratio >= CONTRADICTION_THRESHOLD and payload.get("status") != "disputed":
-                updates["status"] = "disputed"
-                log_event(
-                    claim_id,
-                    "agent_status_update",
-                    1.0,
-                    "status set to disputed by contradiction ratio",
-                    agent_name=self.name,
-                )
-
-            previous_alert = payload.get("alert_level")
-            if previous_alert != alert_level and alert_level in {"medium", "high"}:
-                log_event(
-                    claim_id,
-                    "agent_trend_alert",
-                    0.0,
-                    f"alert level={alert_level} trend={trend_score} ratio={round(ratio, 3)}",
-                    agent_name=self.name,
-                )
-
-            previous_vol = safe_float(payload.get("volatility_score"))
-            if vol_score >= VOLATILITY_ALERT_THRESHOLD and previous_vol < VOLATILITY_ALERT_THRESHOLD:
-                summary["volatility_flags"] += 1
-                log_event(
-                    claim_id,
-                    "agent_volatility",
-                    vol_score - previous_vol,
-                    f"confidence events={vol_events}",
-                    agent_name=self.name,
-                )
-
-            update_payload(CLAIMS_COLLECTION, claim_id, updates)
-            summary["claims_updated"] += 1
-            summary["claims_processed"] += 1
-            if alert_level == "high":
-                summary["high_alerts"] += 1
-            elif alert_level == "medium":
-                summary["medium_alerts"] += 1
-            if updates.get("status") == "disputed":
-                summary["claims_disputed"] += 1
 
+        with telemetry.phase("qdrant_payload_writes"):
+            update_payloads(CLAIMS_COLLECTION, updates)
+        with telemetry.phase("sqlite_claim_state_writes"):
+            upsert_claim_states(updates)
+        with telemetry.phase("event_logging"):
+            log_events(events)
+        telemetry.count("qdrant_requests", 1 if updates else 0)
+        telemetry.count("sqlite_queries", 1 if updates else 0)
+        telemetry.count("events_logged", len(events))
         return summary
 
+    def _process_claim(
+        self,
+        claim_id: str,
+        payload: Dict[str, Any],
+        trend_counts: Dict[str, Dict[str, int]],
+        volatility_counts: Dict[str, int],
+        media_phashes: Dict[str, str],
+        events: List[EventRow],
+        summary: Dict[str, int],
+    ) -> Dict[str, Any]:
+        windows = trend_counts.get(claim_id, {})
+        trend_score = float(windows.get("trend_score", 0))
+        with self.telemetry.phase("qdrant_evidence_counts"):
+            support_recent, contradict_recent = self._evidence_stance_counts(claim_id)
+        self.telemetry.count("qdrant_requests", 2)
+        self.telemetry.count("claims")
+        ratio = contradiction_ratio(support_recent, contradict_recent)
+        meme_variants = self._meme_variant_count(payload.get("linked_media_ids", []), media_phashes)
+        vol_events = safe_int(volatility_counts.get(claim_id, 0))
+        vol_score = volatility_score(vol_events)
+        alert_level = compute_alert_level(trend_score, ratio, vol_score)
+
+        updates: Dict[str, Any] = {
+            "trend_score": trend_score,
+            "trend_1d": float(windows.get("trend_1d", 0)),
+            "trend_30d": float(windows.get("trend_30d", 0)),
+            "contradiction_ratio": ratio,
+            "meme_variant_count": meme_variants,
+            "volatility_score": vol_score,
+            "alert_level": alert_level,
+            "last_agent_update_ts": now_iso(),
+        }
+
+        def record(event_type: str, delta: float, reason: str) -> None:
+            events.append((claim_id, event_type, delta, reason, None, self.name))
+
+        previous_trend = safe_float(payload.get("trend_score"))
+        if trend_score > previous_trend:
+            record(
+                "agent_reinforce",
+                trend_score - previous_trend,
+                f"trend window mentions={trend_score}",
+            )
+
+        previous_ratio = safe_float(payload.get("contradiction_ratio"))
+        if abs(ratio - previous_ratio) >= 0.1:
+            record(
+                "agent_contradict_shift",
+                ratio - previous_ratio,
+                f"support={support_recent} contradict={contradict_recent}",
+            )
+
+        if ratio >= CONTRADICTION_THRESHOLD and payload.get("status") != "disputed":
+            updates["status"] = "disputed"
+            record("agent_status_update", 1.0, "status set to disputed by contradiction ratio")
+
+        previous_alert = payload.get("alert_level")
+        if previous_alert != alert_level and alert_level in {"medium", "high"}:
+            record(
+                "agent_trend_alert",
+                0.0,
+                f"alert level={alert_level} trend={trend_score} ratio={round(ratio, 3)}",
+            )
+
+        previous_vol = safe_float(payload.get("volatility_score"))
+        if vol_score >= VOLATILITY_ALERT_THRESHOLD and previous_vol < VOLATILITY_ALERT_THRESHOLD:
+            summary["volatility_flags"] += 1
+            record("agent_volatility", vol_score - previous_vol, f"confidence events={vol_events}")
+
+        summary["claims_updated"] += 1
+        summary["claims_processed"] += 1
+        if alert_level == "high":
+            summary["high_alerts"] += 1
+        elif alert_level == "medium":
+            summary["medium_alerts"] += 1
+        if updates.get("status") == "disputed":
+            summary["claims_disputed"] += 1
+        return updates
+
     def _fetch_claim_ids(self, source_ids: List[str], force_full_scan: bool) -> List[str]:
-        conn = get_connection()
         if force_full_scan:
-            rows = conn.execute("SELECT DISTINCT claim_id FROM claim_links").fetchall()
+            with read_connection() as conn:
+                rows = conn.execute("SELECT DISTINCT claim_id FROM claim_links").fetchall()
             return list({row["claim_id"] for row in rows})
         if not source_ids:
             return []
         claim_ids: List[str] = []
-        for batch in chunk_list(source_ids):
-            placeholders = ",".join("?" for _ in batch)
-            statement = f"""
-                SELECT DISTINCT claim_id FROM claim_links
-                WHERE source_id IN ({placeholders})
-                """
-            rows = conn.execute(statement, tuple(batch)).fetchall()
-            claim_ids.extend([row["claim_id"] for row in rows])
+        with read_connection() as conn:
+            for batch in chunk_list(source_ids):
+                placeholders = ",".join("?" for _ in batch)
+                statement = f"""
+                    SELECT DISTINCT claim_id FROM claim_links
+                    WHERE source_id IN ({placeholders})
+                    """
+                rows = conn.execute(statement, tuple(batch)).fetchall()
+                claim_ids.extend([row["claim_id"] for row in rows])
         return list({cid for cid in claim_ids if cid})
 
-    def _fetch_trend_counts(self, claim_ids: List[str]) -> Dict[str, int]:
-        conn = get_connection()
-        cutoff = cutoff_days(TREND_WINDOW_DAYS).isoformat() + "Z"
-        counts: Dict[str, int] = {}
-        for batch in chunk_list(claim_ids):
-            placeholders = ",".join("?" for _ in batch)
-            statement = f"""
-                SELECT claim_links.claim_id AS claim_id, COUNT(DISTINCT sources.source_id) AS cnt
-                FROM claim_links
-                JOIN sources ON sources.source_id = claim_links.source_id
-                WHERE sources.timestamp >= ? AND claim_links.claim_id IN ({placeholders})
-                GROUP BY claim_links.claim_id
-                """
-            params = (cutoff, *batch)
-            rows = conn.execute(statement, params).fetchall()
-            for row in rows:
-                counts[row["claim_id"]] = int(row["cnt"])
-        return counts
-
-    def _evidence_stance_counts(self, claim_id: str, claim_text: str) -> Tuple[int, int]:
-        support = 0
-        contradict = 0
-        client = get_client()
-        offset = None
-        query_filter = models.Filter(
-            must=[models.FieldCondition(key="claim_id", match=models.MatchValue(value=claim_id))]
+    def _fetch_trend_counts(self, claim_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        return mention_counts(claim_ids, TREND_WINDOWS)
+
+    def _fetch_volatility_counts(self, claim_ids: List[str]) -> Dict[str, int]:
+        cutoff = cutoff_days(VOLATILITY_WINDOW_DAYS).isoformat() + "Z"
+        return count_events_by_claim(claim_ids, ("confidence", "decay"), cutoff)
+
+    def _evidence_stance_counts(self, claim_id: str) -> Tuple[int, int]:
+        since = now_epoch() - CONTRADICTION_WINDOW_DAYS * 86400
+        counts = count_evidence_stances(claim_id, since)
+        return counts["support"], counts["contradict"]
+
+    def _fetch_media_phashes(self, points: List[Any]) -> Dict[str, str]:
+        media_ids = uniq_list(
+            str(media_id)
+            for point in points
+            for media_id in (point.payload or {}).get("linked_media_ids") or []
         )
-        while True:
-            points, next_offset = client.scroll(
-                collection_name=EVIDENCE_COLLECTION,
-                scroll_filter=query_filter,
-                limit=100,
-                offset=offset,
-                with_payload=True,
-            )
-            for point in points:
-                payload = point.payload or {}
-                if not is_within_days(payload.get("timestamp"), CONTRADICTION_WINDOW_DAYS):
-                    continue
-                stance = payload.get("stance")
-                if not stance and claim_text:
-                    snippet = payload.get("snippet_text", "")
-                    stance = classify_stance(snippet, claim_text)
-                    update_payload(EVIDENCE_COLLECTION, str(point.id), {"stance": stance})
-                if stance == "support":
-                    support += 1
-                elif stance == "contradict":
-                    contradict += 1
-            if next_offset is None:
-                break
-            offset = next_offset
-        return support, contradict
-
-    def _meme_variant_count(self, linked_media_ids: Optional[List[str]]) -> int:
+        phashes: Dict[str, str] = {}
+        for batch in chunk_list(media_ids, size=CLAIM_FETCH_BATCH_SIZE):
+            self.telemetry.count("qdrant_requests")
+            for media in get_points(MEDIA_COLLECTION, batch, payload_fields=["phash"]):
+                phash = (media.payload or {}).get("phash")
+                if phash:
+                    phashes[str(media.id)] = str(phash)
+        return phashes
+
+    def _meme_variant_count(
+        self, linked_media_ids: Optional[List[str]], media_phashes: Dict[str, str]
+    ) -> int:
         if not linked_media_ids:
             return 0
-        phashes: Set[str] = set()
-        for media_id in linked_media_ids:
-            point = get_point(MEDIA_COLLECTION, media_id)
-            if point and point.payload:
-                phash = point.payload.get("phash")
-                if phash:
-                    phashes.add(str(phash))
-                else:
-                    phashes.add(str(media_id))
-            else:
-                phashes.add(str(media_id))
-        return len(phashes)
-
-    def _confidence_event_count(self, conn, claim_id: str) -> int:
-        cutoff = cutoff_days(VOLATILITY_WINDOW_DAYS).isoformat() + "Z"
-        row = conn.execute(
-            """
-            SELECT COUNT(*) AS cnt FROM events
-            WHERE claim_id = ? AND event_type IN (?, ?)
-            AND timestamp >= ?
-            """,
-            (claim_id, "confidence", "decay", cutoff),
-        ).fetchone()
-        return safe_int(row["cnt"] if row else 0)
+        variants: Set[str] = {
+            media_phashes.get(str(media_id), str(media_id)) for media_id in linked_media_ids
+        }
+        return len(variants)
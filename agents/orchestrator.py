@@ -1,37 +1,173 @@
+import time
 from typing import Any, Dict, List, Optional
 
-from agents.claim_evolution_agent import ClaimEvolutionAgent
+from agents.claim_evolution_agent import (
+    CLAIM_FETCH_BATCH_SIZE,
+    SUMMARY_KEYS,
+    ClaimEvolutionAgent,
+)
+from agents.utils import chunk_list
+from core.config import settings
 from core.utils import now_iso
+from memory.events import flush_events
+from storage.agent_runs import record_agent_run
 from storage.agent_state import get_agent_state, set_agent_state
-from storage.sqlite import get_connection
+from storage.claim_links import window_start_day
+from storage.dirty_claims import (
+    ack_dirty_claims,
+    dirty_backlog,
+    latest_dirty_seq,
+    mark_claims_dirty,
+    next_dirty_batch,
+)
+from storage.leases import held_lease
+from storage.sqlite import read_connection, temp_id_table
 
 
-def _fetch_sources_since(last_run_ts: Optional[str]) -> List[str]:
-    conn = get_connection()
-    if last_run_ts:
+DIRTY_BATCH_SIZE = 1000
+VELOCITY_WINDOW_DAYS = 1
+
+
+def _read_cursor(state: Optional[Dict[str, Any]]) -> int:
+    try:
+        return int((state or {}).get("cursor") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _prioritize_claims(claim_ids: List[str]) -> List[str]:
+    # High alerts first, then recent mention velocity, then the stalest agent update.
+    since = window_start_day(VELOCITY_WINDOW_DAYS)
+    with read_connection() as conn, temp_id_table(conn, claim_ids, "priority_claim_ids") as ids:
         rows = conn.execute(
-            "SELECT source_id FROM sources WHERE timestamp > ? ORDER BY timestamp",
-            (last_run_ts,),
+            f"""
+            SELECT ids.id AS claim_id
+            FROM {ids} AS ids
+            LEFT JOIN claim_state ON claim_state.claim_id = ids.id
+            ORDER BY
+                CASE claim_state.alert_level WHEN 'high' THEN 2 WHEN 'medium' THEN 1 ELSE 0 END DESC,
+                (
+                    SELECT COALESCE(SUM(mentions), 0) FROM claim_mention_buckets
+                    WHERE claim_mention_buckets.claim_id = ids.id
+                        AND claim_mention_buckets.day >= ?
+                ) DESC,
+                COALESCE(claim_state.last_agent_update_ts, '') ASC,
+                ids.id
+            """,
+            (since,),
         ).fetchall()
-    else:
-        rows = conn.execute("SELECT source_id FROM sources ORDER BY timestamp").fetchall()
-    return [row["source_id"] for row in rows]
+    return [row["claim_id"] for row in rows]
+
+
+def agent_backlog() -> int:
+    return dirty_backlog(_read_cursor(get_agent_state(ClaimEvolutionAgent.name)))
 
 
 def run_claim_evolution_agent(
     source_ids: Optional[List[str]] = None,
     force_full_scan: bool = False,
     run_decay: bool = False,
+    time_budget_seconds: Optional[float] = None,
+    claim_budget: Optional[int] = None,
+) -> Dict[str, Any]:
+    # Every entry point (scheduler, ingestion, ingest workers, UI) goes through the
+    # agent lease so only one run advances the dirty-queue cursor at a time. When
+    # it is held elsewhere nothing runs: queued claims stay queued for the holder's
+    # next batch or the next scheduled run.
+    with held_lease(ClaimEvolutionAgent.name, settings.job_lease_ttl_seconds) as acquired:
+        if not acquired:
+            summary: Dict[str, Any] = dict.fromkeys(SUMMARY_KEYS, 0)
+            summary["skipped"] = True
+            return summary
+        return _run_claim_evolution_agent(
+            source_ids, force_full_scan, run_decay, time_budget_seconds, claim_budget
+        )
+
+
+def _run_claim_evolution_agent(
+    source_ids: Optional[List[str]],
+    force_full_scan: bool,
+    run_decay: bool,
+    time_budget_seconds: Optional[float],
+    claim_budget: Optional[int],
 ) -> Dict[str, Any]:
     agent = ClaimEvolutionAgent()
-    state = get_agent_state(agent.name)
-    last_run_ts = state["last_run_ts"] if state else None
+    telemetry = agent.telemetry
+    started_ts = now_iso()
+    cursor = _read_cursor(get_agent_state(agent.name))
+
+    if force_full_scan or source_ids is not None:
+        mode = "full_scan" if force_full_scan else "sources"
+        # Everything queued before a full scan is covered by it.
+        upto_seq = latest_dirty_seq() if force_full_scan else cursor
+        summary = agent.run(
+            source_ids=source_ids, force_full_scan=force_full_scan, run_decay=run_decay
+        )
+        if upto_seq > cursor:
+            ack_dirty_claims(upto_seq)
+            cursor = upto_seq
+    else:
+        if time_budget_seconds is None:
+            time_budget_seconds = settings.agent_time_budget_seconds
+        if claim_budget is None:
+            claim_budget = settings.agent_claim_budget
+        budgeted = time_budget_seconds > 0 or claim_budget > 0
+        mode = "budgeted" if budgeted else "incremental"
+        deadline = time.monotonic() + time_budget_seconds if time_budget_seconds > 0 else None
+        claims_left = claim_budget if claim_budget > 0 else None
+        # Budgeted runs rank the whole pending queue so urgent claims go first.
+        batch_size = -1 if budgeted else DIRTY_BATCH_SIZE
+        slice_size = CLAIM_FETCH_BATCH_SIZE * max(1, settings.agent_workers)
 
-    if force_full_scan:
-        source_ids = _fetch_sources_since(None)
-    elif source_ids is None:
-        source_ids = _fetch_sources_since(last_run_ts)
+        if run_decay:
+            agent.run_decay_pass()
+        summary = dict.fromkeys(SUMMARY_KEYS, 0)
+        while True:
+            with telemetry.phase("dirty_queue_read"):
+                upto_seq, claim_ids = next_dirty_batch(cursor, batch_size)
+            telemetry.count("sqlite_queries")
+            if not claim_ids:
+                break
+            ordered = claim_ids
+            if budgeted:
+                with telemetry.phase("prioritize"):
+                    ordered = _prioritize_claims(claim_ids)
+                telemetry.count("sqlite_queries")
+            processed = 0
+            for claim_slice in chunk_list(ordered, size=slice_size):
+                # The first slice always runs so a tight budget still makes progress.
+                if processed and deadline is not None and time.monotonic() >= deadline:
+                    break
+                if claims_left is not None:
+                    if claims_left <= 0:
+                        break
+                    claim_slice = claim_slice[:claims_left]
+                    claims_left -= len(claim_slice)
+                batch_summary = agent.run(claim_ids=claim_slice)
+                for key, value in batch_summary.items():
+                    summary[key] += value
+                processed += len(claim_slice)
+            # Unprocessed claims go back on the queue ahead of the cursor move.
+            deferred = ordered[processed:]
+            summary["claims_deferred"] += len(deferred)
+            with telemetry.phase("dirty_queue_ack"):
+                mark_claims_dirty(deferred, "deferred")
+                # Persist the cursor per batch so an interrupted run resumes after it.
+                set_agent_state(agent.name, now_iso(), str(upto_seq), {"last_summary": summary})
+                ack_dirty_claims(upto_seq)
+            cursor = upto_seq
+            if deferred:
+                break
 
-    summary = agent.run(source_ids=source_ids, force_full_scan=force_full_scan, run_decay=run_decay)
-    set_agent_state(agent.name, now_iso(), None, {"last_summary": summary})
+    with telemetry.phase("event_flush"):
+        flush_events()
+    run_telemetry = telemetry.as_dict()
+    set_agent_state(
+        agent.name,
+        now_iso(),
+        str(cursor),
+        {"last_summary": summary, "last_telemetry": run_telemetry},
+    )
+    if summary["claims_processed"] or summary["claims_deferred"]:
+        record_agent_run(agent.name, mode, started_ts, summary, run_telemetry)
     return summary
@@ -1,8 +1,23 @@
 import sys
+from datetime import datetime, timedelta
+from typing import Callable
 
-from agents.orchestrator import run_claim_evolution_agent
+from agents.orchestrator import agent_backlog, run_claim_evolution_agent
+from agents.utils import TREND_WINDOWS, parse_iso
+from core.config import settings
+from core.utils import now_iso
 from memory.decay import apply_decay
-from memory.events import log_event
+from memory.events import compact_events, flush_events, log_event
+from memory.evidence import backfill_evidence_stances
+from storage.agent_runs import prune_agent_runs
+from storage.agent_state import get_agent_state, set_agent_state
+from storage.claim_links import prune_mention_buckets
+from storage.ingest_jobs import prune_ingest_jobs
+from storage.leases import held_lease
+from storage.query_cache import prune_query_cache
+
+
+AGENT_JOB_ID = "claim_evolution"
 
 
 def _run_decay_job() -> None:
@@ -14,6 +29,82 @@ def _run_decay_job() -> None:
         f"decay applied to {updated} claims",
         agent_name="claim_evolution",
     )
+    flush_events()
+
+
+def _run_compaction_job() -> None:
+    compacted = compact_events()
+    log_event(
+        "system",
+        "events_compacted",
+        float(compacted),
+        f"rolled up {compacted} events older than retention window",
+        agent_name="claim_evolution",
+    )
+    prune_agent_runs(settings.event_retention_days)
+    prune_query_cache()
+    prune_ingest_jobs(settings.event_retention_days)
+    pruned = prune_mention_buckets(max(TREND_WINDOWS.values()))
+    log_event(
+        "system",
+        "mention_buckets_pruned",
+        float(pruned),
+        f"pruned {pruned} mention buckets outside the longest trend window",
+        agent_name="claim_evolution",
+    )
+    flush_events()
+
+
+def _run_stance_backfill_job() -> None:
+    labelled = backfill_evidence_stances()
+    if labelled:
+        log_event(
+            "system",
+            "evidence_stances_backfilled",
+            float(labelled),
+            f"labelled {labelled} evidence points",
+            agent_name="claim_evolution",
+        )
+        flush_events()
+
+
+def _leased_periodic(job_name: str, job: Callable[[], None], every: timedelta) -> Callable[[], None]:
+    # Periodic jobs run under a lease and are skipped when any scheduler instance
+    # completed them within the last half interval.
+    state_name = f"job:{job_name}"
+
+    def run() -> None:
+        with held_lease(job_name, settings.job_lease_ttl_seconds) as acquired:
+            if not acquired:
+                return
+            state = get_agent_state(state_name)
+            last_run = parse_iso(state["last_run_ts"]) if state else None
+            if last_run and datetime.utcnow() - last_run < every / 2:
+                return
+            job()
+            set_agent_state(state_name, now_iso(), None, None)
+
+    return run
+
+
+def next_agent_interval(current_seconds: float, backlog: int) -> float:
+    if backlog >= settings.agent_backlog_high:
+        return settings.agent_interval_min_seconds
+    if backlog == 0:
+        return min(current_seconds * 2, settings.agent_interval_max_seconds)
+    return settings.agent_interval_seconds
+
+
+def _run_agent_job(scheduler) -> None:
+    # run_claim_evolution_agent takes the agent lease itself.
+    run_claim_evolution_agent()
+    job = scheduler.get_job(AGENT_JOB_ID)
+    if job is None:
+        return
+    current = job.trigger.interval.total_seconds()
+    interval = next_agent_interval(current, agent_backlog())
+    if interval != current:
+        scheduler.reschedule_job(AGENT_JOB_ID, trigger="interval", seconds=interval)
 
 
 def main() -> None:
@@ -22,9 +113,26 @@ def main() -> None:
     except ImportError as exc:
         raise SystemExit("APScheduler is not installed. Run: pip install apscheduler") from exc
 
-    scheduler = BlockingScheduler()
-    scheduler.add_job(run_claim_evolution_agent, "interval", minutes=10)
-    scheduler.add_job(_run_decay_job, "interval", hours=24)
+    scheduler = BlockingScheduler(job_defaults={"max_instances": 1, "coalesce": True})
+    scheduler.add_job(
+        _run_agent_job,
+        "interval",
+        seconds=settings.agent_interval_seconds,
+        args=[scheduler],
+        id=AGENT_JOB_ID,
+    )
+    periodic = [
+        ("decay", _run_decay_job, timedelta(hours=24)),
+        ("compaction", _run_compaction_job, timedelta(hours=24)),
+        ("stance_backfill", _run_stance_backfill_job, timedelta(hours=1)),
+    ]
+    for job_name, job, every in periodic:
+        scheduler.add_job(
+            _leased_periodic(job_name, job, every),
+            "interval",
+            seconds=every.total_seconds(),
+            id=job_name,
+        )
 
     try:
         scheduler.start()
@@ -0,0 +1,43 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+
+class RunTelemetry:
+    # Per-run phase timers and request counters. Safe to share across the
+    # agent's worker threads; phase totals are summed over threads.
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.phase_calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+                self.phase_calls[name] = self.phase_calls.get(name, 0) + 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            duration = time.perf_counter() - self._started
+            claims = self.counters.get("claims", 0)
+            return {
+                "duration_seconds": round(duration, 4),
+                "claims_per_second": round(claims / duration, 3) if duration > 0 else 0.0,
+                "phases": {name: round(value, 4) for name, value in sorted(self.phases.items())},
+                "phase_calls": dict(sorted(self.phase_calls.items())),
+                "counters": dict(sorted(self.counters.items())),
+            }
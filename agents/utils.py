@@ -3,6 +3,7 @@ from typing import Iterable, List, Optional
 
 
 TREND_WINDOW_DAYS = 7
+TREND_WINDOWS = {"trend_1d": 1, "trend_score": TREND_WINDOW_DAYS, "trend_30d": 30}
 CONTRADICTION_WINDOW_DAYS = 30
 VOLATILITY_WINDOW_DAYS = 30
 CONTRADICTION_THRESHOLD = 0.6
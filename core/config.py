@@ -10,6 +10,8 @@ class Settings:
     def __init__(self) -> None:
         self.qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
         self.qdrant_api_key = os.getenv("QDRANT_API_KEY") or None
+        self.qdrant_prefer_grpc = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+        self.qdrant_grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
         self.text_model_name = os.getenv(
             "TEXT_MODEL_NAME", "sentence-transformers/all-MiniLM-L6-v2"
         )
@@ -26,8 +28,28 @@ class Settings:
         self.tesseract_cmd = os.getenv("TESSERACT_CMD")
         self.data_dir = os.getenv("DATA_DIR", "data")
         self.sqlite_path = os.getenv("SQLITE_PATH", os.path.join(self.data_dir, "app.db"))
+        self.hybrid_search = os.getenv("HYBRID_SEARCH", "true").lower() == "true"
         self.claim_sim_threshold = float(os.getenv("CLAIM_SIM_THRESHOLD", "0.85"))
         self.decay_days = int(os.getenv("DECAY_DAYS", "30"))
+        self.event_buffer_size = int(os.getenv("EVENT_BUFFER_SIZE", "500"))
+        self.event_flush_seconds = float(os.getenv("EVENT_FLUSH_SECONDS", "2.0"))
+        self.event_retention_days = int(os.getenv("EVENT_RETENTION_DAYS", "90"))
+        self.agent_workers = int(os.getenv("AGENT_WORKERS", "1"))
+        self.agent_interval_seconds = float(os.getenv("AGENT_INTERVAL_SECONDS", "600"))
+        self.agent_interval_min_seconds = float(os.getenv("AGENT_INTERVAL_MIN_SECONDS", "60"))
+        self.agent_interval_max_seconds = float(os.getenv("AGENT_INTERVAL_MAX_SECONDS", "1800"))
+        self.agent_backlog_high = int(os.getenv("AGENT_BACKLOG_HIGH", "500"))
+        self.agent_time_budget_seconds = float(os.getenv("AGENT_TIME_BUDGET_SECONDS", "0"))
+        self.agent_claim_budget = int(os.getenv("AGENT_CLAIM_BUDGET", "0"))
+        self.job_lease_ttl_seconds = float(os.getenv("JOB_LEASE_TTL_SECONDS", "120"))
+        self.retrieval_http_host = os.getenv("RETRIEVAL_HTTP_HOST", "127.0.0.1")
+        self.retrieval_http_port = int(os.getenv("RETRIEVAL_HTTP_PORT", "8502"))
+        self.retrieval_max_batch = int(os.getenv("RETRIEVAL_MAX_BATCH", "256"))
+        self.stance_reuse_threshold = float(os.getenv("STANCE_REUSE_THRESHOLD", "0.9"))
+        self.query_cache_max_entries = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "10000"))
+        self.ingest_worker_batch = int(os.getenv("INGEST_WORKER_BATCH", "8"))
+        self.ingest_poll_seconds = float(os.getenv("INGEST_POLL_SECONDS", "2"))
+        self.ingest_max_attempts = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
 
 
 settings = Settings()
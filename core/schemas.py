@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -28,9 +28,9 @@ class Claim(BaseModel):
 
 class EvidenceSnippet(BaseModel):
     evidence_id: str
-    claim_id: str
+    claim_ids: List[str]
+    stances: Dict[str, str]
     snippet_text: str
-    stance: str
     source_id: str
     source_type: str
     timestamp: str
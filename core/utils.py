@@ -1,13 +1,31 @@
 import hashlib
 import re
-from datetime import datetime
-from typing import Iterable, List
+import time
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
 
 
 def now_iso() -> str:
     return datetime.utcnow().isoformat() + "Z"
 
 
+def now_epoch() -> float:
+    return time.time()
+
+
+def iso_to_epoch(ts: Optional[str]) -> Optional[float]:
+    if not ts:
+        return None
+    normalized = ts[:-1] if ts.endswith("Z") else ts
+    try:
+        dt = datetime.fromisoformat(normalized)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
 def sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
@@ -1,67 +1,81 @@
 import uuid
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from PIL import Image
 
 from core.utils import clean_text, now_iso, uniq_list
 from ingestion.dedup import meme_phash
-from memory.canonicalize import canonicalize_claim
-from memory.events import log_event
+from memory.canonicalize import canonicalize_claims
+from memory.events import log_events
 from models.claim_extractor import extract_claims
 from models.image_embedder import get_image_embedder
 from models.ocr import extract_text
 from models.text_embedder import get_text_embedder
 from qdrant_store.collections import MEDIA_COLLECTION
 from qdrant_store.crud import get_point, search_vectors, upsert_point, update_payload
-from storage.sqlite import get_connection
+from storage.claim_links import link_claims, linked_source_claims
+from storage.dirty_claims import mark_claims_dirty
+from storage.query_cache import bump_corpus_version
+from storage.sqlite import write_connection
 from agents.orchestrator import run_claim_evolution_agent
 
 
-def ingest_meme(path: str, source_type: str = "meme") -> Dict[str, int]:
+def ingest_meme(
+    path: str,
+    source_type: str = "meme",
+    run_agent: bool = True,
+    source_id: Optional[str] = None,
+) -> Dict[str, int]:
+    source_id = source_id or path
     image = Image.open(path).convert("RGB")
     phash = meme_phash(image)
     text_embedder = get_text_embedder()
     image_embedder = get_image_embedder()
-    conn = get_connection()
 
     image_vector = image_embedder.embed([image])[0].tolist()
     ocr_text = clean_text(extract_text(image))
     ocr_vector = text_embedder.embed([ocr_text or "no text"])[0].tolist()
 
+    # Deterministic per (source, image), so a retried job finds its own point
+    # and finishes linking instead of reporting it as a duplicate.
+    media_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{source_id}:{phash}"))
     duplicates = search_vectors(
         MEDIA_COLLECTION,
         "image_dense",
         image_vector,
         limit=3,
+        payload_fields=["phash"],
     )
     for dup in duplicates:
-        if dup.payload and dup.payload.get("phash") == phash:
+        if dup.payload and dup.payload.get("phash") == phash and str(dup.id) != media_id:
             return {"memes_ingested": 0, "memes_deduped": 1}
 
-    with conn:
+    with write_connection() as conn:
         conn.execute(
             "INSERT OR IGNORE INTO sources (source_id, source_type, title, timestamp, url, text_hash) VALUES (?, ?, ?, ?, ?, ?)",
-            (path, source_type, path, now_iso(), None, phash),
+            (source_id, source_type, source_id, now_iso(), None, phash),
         )
 
-    claims = extract_claims(ocr_text or "")
-    linked_claim_ids: List[str] = []
-    for claim in claims:
-        emb = text_embedder.embed([claim])[0].tolist()
-        claim_id, merged = canonicalize_claim(claim, emb, source_type)
-        linked_claim_ids.append(claim_id)
-        with conn:
-            conn.execute(
-                "INSERT INTO claim_links (source_id, claim_id) VALUES (?, ?)",
-                (path, claim_id),
-            )
-        if merged:
-            log_event(claim_id, "reinforce", 0.0, "meme mention", path)
+    linked_claim_ids: List[str] = linked_source_claims(source_id, phash)
+    claims = [] if linked_claim_ids else extract_claims(ocr_text or "")
+    if claims:
+        embeddings = text_embedder.embed(claims).tolist()
+        canonical = canonicalize_claims(
+            [(claim, emb, source_type) for claim, emb in zip(claims, embeddings)]
+        )
+        linked_claim_ids = [claim_id for claim_id, _ in canonical]
+        link_claims(source_id, linked_claim_ids)
+        log_events(
+            [
+                (claim_id, "reinforce", 0.0, "meme mention", source_id, None)
+                for claim_id, merged in canonical
+                if merged
+            ]
+        )
 
-    media_id = str(uuid.uuid4())
     payload = {
         "media_id": media_id,
-        "source_id": path,
+        "source_id": source_id,
         "timestamp": now_iso(),
         "phash": phash,
         "ocr_text": ocr_text,
@@ -75,7 +89,7 @@ def ingest_meme(path: str, source_type: str = "meme") -> Dict[str, int]:
     )
 
     for claim_id in linked_claim_ids:
-        existing = get_point("claims", claim_id)
+        existing = get_point("claims", claim_id, payload_fields=["linked_media_ids"])
         current = existing.payload.get("linked_media_ids", []) if existing else []
         update_payload(
             "claims",
@@ -83,5 +97,8 @@ def ingest_meme(path: str, source_type: str = "meme") -> Dict[str, int]:
             {"linked_media_ids": uniq_list(current + [media_id])},
         )
 
-    run_claim_evolution_agent([path], force_full_scan=False)
+    mark_claims_dirty(linked_claim_ids, "media")
+    bump_corpus_version()
+    if run_agent:
+        run_claim_evolution_agent()
     return {"memes_ingested": 1, "memes_deduped": 0}
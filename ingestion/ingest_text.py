@@ -1,75 +1,97 @@
 import uuid
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from core.utils import chunk_text, now_iso
+from core.utils import chunk_text, now_epoch, now_iso, uniq_list
 from ingestion.dedup import text_hash
-from memory.canonicalize import canonicalize_claim
+from memory.canonicalize import canonicalize_claims
 from memory.confidence import update_confidence
-from memory.events import log_event
+from memory.events import log_event, log_events
+from memory.evidence import evidence_stance_fields
 from models.claim_extractor import extract_claims
+from models.sparse_embedder import get_sparse_embedder
 from models.stance_classifier import classify_stance
 from models.text_embedder import get_text_embedder
 from qdrant_store.collections import EVIDENCE_COLLECTION
-from qdrant_store.crud import get_point, upsert_point, update_payload
-from storage.sqlite import get_connection
+from qdrant_store.crud import get_point, get_points, upsert_point, update_payload
+from storage.claim_links import link_claims, linked_source_claims
+from storage.claim_state import upsert_claim_state
+from storage.dirty_claims import mark_claims_dirty
+from storage.query_cache import bump_corpus_version
+from storage.sqlite import write_connection
 from agents.orchestrator import run_claim_evolution_agent
 
 
-def ingest_text(path: str, source_type: str = "article") -> Dict[str, int]:
+def ingest_text(
+    path: str,
+    source_type: str = "article",
+    run_agent: bool = True,
+    source_id: Optional[str] = None,
+) -> Dict[str, int]:
+    # source_id defaults to the path; queued uploads pass their original filename.
     with open(path, "r", encoding="utf-8") as f:
         text = f.read()
     text_embedder = get_text_embedder()
-    conn = get_connection()
-    source_id = path
+    sparse_embedder = get_sparse_embedder()
+    source_id = source_id or path
     text_digest = text_hash(text)
 
-    with conn:
+    with write_connection() as conn:
         conn.execute(
             "INSERT OR IGNORE INTO sources (source_id, source_type, title, timestamp, url, text_hash) VALUES (?, ?, ?, ?, ?, ?)",
-            (source_id, source_type, path, now_iso(), None, text_digest),
+            (source_id, source_type, source_id, now_iso(), None, text_digest),
         )
 
     chunks = chunk_text(text)
-    claim_candidates = extract_claims(text)
+    # A retried job (or a re-upload of the same text) resumes from the claims it
+    # already linked instead of extracting and counting them a second time.
+    linked_claim_ids = linked_source_claims(source_id, text_digest)
+    claim_candidates = [] if linked_claim_ids else extract_claims(text)
     claim_ids: List[str] = []
-    for claim in claim_candidates:
-        emb = text_embedder.embed([claim])[0].tolist()
-        claim_id, merged = canonicalize_claim(claim, emb, source_type)
-        claim_ids.append(claim_id)
-        with conn:
-            conn.execute(
-                "INSERT INTO claim_links (source_id, claim_id) VALUES (?, ?)",
-                (source_id, claim_id),
-            )
-        if merged:
-            log_event(claim_id, "reinforce", 0.0, "text mention", source_id)
+    if claim_candidates:
+        embeddings = text_embedder.embed(claim_candidates).tolist()
+        canonical = canonicalize_claims(
+            [(claim, emb, source_type) for claim, emb in zip(claim_candidates, embeddings)]
+        )
+        claim_ids = [claim_id for claim_id, _ in canonical]
+        link_claims(source_id, claim_ids)
+        log_events(
+            [
+                (claim_id, "reinforce", 0.0, "text mention", source_id, None)
+                for claim_id, merged in canonical
+                if merged
+            ]
+        )
 
+        linked_claim_ids = uniq_list(claim_ids)
+
+    # Evidence ids are derived from the source content and chunk position, so
+    # chunks stored by an earlier attempt are skipped, confidence updates included.
+    evidence_ids = [
+        str(uuid.uuid5(uuid.NAMESPACE_URL, f"{source_id}:{text_digest}:{index}"))
+        for index in range(len(chunks))
+    ]
+    stored_ids = set()
+    if linked_claim_ids:
+        stored_ids = {
+            str(point.id)
+            for point in get_points(EVIDENCE_COLLECTION, evidence_ids, payload_fields=["evidence_id"])
+        }
     evidence_added = 0
-    for chunk in chunks:
-        for claim_id in claim_ids:
-            claim_point = get_point("claims", claim_id)
+    for chunk, evidence_id in zip(chunks, evidence_ids):
+        if not linked_claim_ids:
+            break
+        if evidence_id in stored_ids:
+            continue
+        stances: Dict[str, str] = {}
+        for claim_id in linked_claim_ids:
+            claim_point = get_point(
+                "claims",
+                claim_id,
+                payload_fields=["claim_text", "confidence", "support_count", "contradict_count"],
+            )
             claim_text = claim_point.payload.get("claim_text", "") if claim_point else ""
             stance = classify_stance(chunk, claim_text)
-            evidence_id = str(uuid.uuid4())
-            snippet_vector = text_embedder.embed([chunk])[0].tolist()
-            payload = {
-                "evidence_id": evidence_id,
-                "claim_id": claim_id,
-                "snippet_text": chunk,
-                "stance": stance,
-                "source_id": source_id,
-                "source_type": source_type,
-                "timestamp": now_iso(),
-                "url": None,
-                "credibility_tier": "C",
-            }
-            upsert_point(
-                EVIDENCE_COLLECTION,
-                evidence_id,
-                {"snippet_dense": snippet_vector},
-                payload,
-            )
-            evidence_added += 1
+            stances[claim_id] = stance
             if claim_point:
                 current_conf = float(claim_point.payload.get("confidence", 0.5))
                 new_conf, delta = update_confidence(current_conf, stance, "C")
@@ -79,16 +101,40 @@ def ingest_text(path: str, source_type: str = "article") -> Dict[str, int]:
                 contradict_count = int(claim_point.payload.get("contradict_count", 0)) + (
                     1 if stance == "contradict" else 0
                 )
-                update_payload(
-                    "claims",
-                    claim_id,
-                    {
-                        "confidence": new_conf,
-                        "support_count": support_count,
-                        "contradict_count": contradict_count,
-                    },
-                )
+                confidence_update = {
+                    "confidence": new_conf,
+                    "support_count": support_count,
+                    "contradict_count": contradict_count,
+                }
+                update_payload("claims", claim_id, confidence_update)
+                upsert_claim_state(claim_id, confidence_update)
                 log_event(claim_id, "confidence", delta, f"stance {stance}", source_id)
 
-    run_claim_evolution_agent([source_id], force_full_scan=False)
+        snippet_vector = text_embedder.embed([chunk])[0].tolist()
+        snippet_sparse = sparse_embedder.embed([chunk])[0]
+        payload = {
+            "evidence_id": evidence_id,
+            "claim_ids": linked_claim_ids,
+            **evidence_stance_fields(stances),
+            "snippet_text": chunk,
+            "source_id": source_id,
+            "source_type": source_type,
+            "timestamp": now_iso(),
+            "ts": now_epoch(),
+            "url": None,
+            "credibility_tier": "C",
+        }
+        upsert_point(
+            EVIDENCE_COLLECTION,
+            evidence_id,
+            {"snippet_dense": snippet_vector, "snippet_sparse": snippet_sparse},
+            payload,
+        )
+        evidence_added += 1
+
+    if evidence_added:
+        mark_claims_dirty(linked_claim_ids, "evidence")
+    bump_corpus_version()
+    if run_agent:
+        run_claim_evolution_agent()
     return {"evidence_added": evidence_added, "claims_created": len(set(claim_ids))}
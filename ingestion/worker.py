@@ -0,0 +1,92 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from agents.orchestrator import run_claim_evolution_agent
+from core.config import settings
+from ingestion.ingest_meme import ingest_meme
+from ingestion.ingest_text import ingest_text
+from memory.events import flush_events
+from qdrant_store.collections import ensure_collections
+from storage.ingest_jobs import (
+    claim_ingest_jobs,
+    fail_ingest_job,
+    finish_ingest_job,
+    renew_ingest_jobs,
+)
+from storage.leases import lease_owner_id
+
+
+INGESTERS = {"text": ingest_text, "meme": ingest_meme}
+
+
+@contextmanager
+def renewed_jobs(worker: str, ttl_seconds: float) -> Iterator[None]:
+    # Same heartbeat as storage.leases.held_lease: every ttl/3 the worker's
+    # running jobs get a fresh lease, so a slow file (large text, first model
+    # load) is never reclaimed by another worker while it is still in progress.
+    stop = threading.Event()
+
+    def renew() -> None:
+        while not stop.wait(ttl_seconds / 3):
+            renew_ingest_jobs(worker, ttl_seconds)
+
+    heartbeat = threading.Thread(target=renew, name=f"ingest-{worker}", daemon=True)
+    heartbeat.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        heartbeat.join()
+
+
+def run_once(worker: str) -> Dict[str, int]:
+    # Claims up to INGEST_WORKER_BATCH jobs, ingests them one by one and runs the
+    # claim evolution agent once for the whole batch instead of once per file.
+    ttl_seconds = settings.job_lease_ttl_seconds
+    jobs = claim_ingest_jobs(
+        worker, settings.ingest_worker_batch, ttl_seconds, settings.ingest_max_attempts
+    )
+    stats = {"claimed": len(jobs), "done": 0, "failed": 0}
+    if not jobs:
+        return stats
+    with renewed_jobs(worker, ttl_seconds):
+        for job in jobs:
+            try:
+                result = INGESTERS[job["kind"]](
+                    job["path"], run_agent=False, source_id=job["source_name"]
+                )
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                fail_ingest_job(job["job_id"], worker, error, settings.ingest_max_attempts)
+                stats["failed"] += 1
+                continue
+            finish_ingest_job(job["job_id"], worker, result)
+            stats["done"] += 1
+    if stats["done"]:
+        # Runs under the claim_evolution lease (taken inside the orchestrator),
+        # so it never overlaps the scheduler or another worker's agent pass.
+        run_claim_evolution_agent()
+    flush_events()
+    return stats
+
+
+def main() -> None:
+    ensure_collections()
+    worker = lease_owner_id()
+    print(f"Ingest worker {worker} polling every {settings.ingest_poll_seconds}s")
+    try:
+        while True:
+            stats = run_once(worker)
+            if stats["claimed"]:
+                print(f"ingest batch: {stats}")
+            else:
+                time.sleep(settings.ingest_poll_seconds)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,44 +1,30 @@
 import uuid
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
 
 from core.config import settings
-from core.utils import now_iso, uniq_list
-from memory.events import log_event
+from core.utils import now_epoch, now_iso, uniq_list
+from memory.events import EventRow, log_events
+from models.sparse_embedder import get_sparse_embedder
 from qdrant_store.collections import CLAIMS_COLLECTION
-from qdrant_store.crud import search_vectors, upsert_point, update_payload
+from qdrant_store.crud import search_vectors_batch, update_payloads, upsert_points
+from storage.claim_state import upsert_claim_states
+from storage.dirty_claims import mark_claims_dirty
 
 
-def canonicalize_claim(
-    claim_text: str,
-    embedding: List[float],
-    source_type: str,
-) -> Tuple[str, bool]:
-    matches = search_vectors(CLAIMS_COLLECTION, "text_dense", embedding, limit=5)
-    if matches and matches[0].score >= settings.claim_sim_threshold:
-        point = matches[0]
-        payload = point.payload
-        mention_count = int(payload.get("mention_count", 1)) + 1
-        source_types = uniq_list(payload.get("source_types", []) + [source_type])
-        update_payload(
-            CLAIMS_COLLECTION,
-            point.id,
-            {
-                "mention_count": mention_count,
-                "last_seen_ts": now_iso(),
-                "source_types": source_types,
-            },
-        )
-        log_event(str(point.id), "merge", 0.0, "claim merged", None)
-        return str(point.id), True
+ClaimCandidate = Tuple[str, List[float], str]
 
-    claim_id = str(uuid.uuid4())
-    payload = {
+
+def _new_claim_payload(claim_id: str, claim_text: str, source_types: List[str], mentions: int) -> Dict[str, Any]:
+    return {
         "canonical_claim_id": claim_id,
         "claim_text": claim_text,
         "first_seen_ts": now_iso(),
         "last_seen_ts": now_iso(),
-        "mention_count": 1,
-        "source_types": [source_type],
+        "last_seen": now_epoch(),
+        "mention_count": mentions,
+        "source_types": source_types,
         "support_count": 0,
         "contradict_count": 0,
         "confidence": 0.5,
@@ -52,6 +38,96 @@ def canonicalize_claim(
         "alert_level": "low",
         "last_agent_update_ts": None,
     }
-    upsert_point(CLAIMS_COLLECTION, claim_id, {"text_dense": embedding}, payload)
-    log_event(claim_id, "create", 0.0, "new canonical claim", None)
-    return claim_id, False
+
+
+def _cluster_candidates(embeddings: np.ndarray, threshold: float) -> List[List[int]]:
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = embeddings / np.maximum(norms, 1e-12)
+    similarity = unit @ unit.T
+    assigned = np.zeros(len(embeddings), dtype=bool)
+    clusters: List[List[int]] = []
+    for index in range(len(embeddings)):
+        if assigned[index]:
+            continue
+        candidates = np.flatnonzero(~assigned & (similarity[index] >= threshold))
+        members = sorted({index, *(int(member) for member in candidates)})
+        assigned[members] = True
+        clusters.append(members)
+    return clusters
+
+
+def canonicalize_claims(batch: List[ClaimCandidate]) -> List[Tuple[str, bool]]:
+    if not batch:
+        return []
+    embeddings = np.array([embedding for _, embedding, _ in batch], dtype="float32")
+    clusters = _cluster_candidates(embeddings, settings.claim_sim_threshold)
+    matches = search_vectors_batch(
+        CLAIMS_COLLECTION,
+        "text_dense",
+        [batch[cluster[0]][1] for cluster in clusters],
+        limit=1,
+        payload_fields=["mention_count", "source_types"],
+    )
+
+    results: List[Tuple[str, bool]] = [("", False)] * len(batch)
+    merges: Dict[str, Dict[str, Any]] = {}
+    creates: List[Dict[str, Any]] = []
+    events: List[EventRow] = []
+    for cluster, hits in zip(clusters, matches):
+        source_types = uniq_list(batch[member][2] for member in cluster)
+        if hits and hits[0].score >= settings.claim_sim_threshold:
+            point = hits[0]
+            claim_id = str(point.id)
+            current = merges.get(claim_id) or {
+                "mention_count": int((point.payload or {}).get("mention_count", 1)),
+                "source_types": list((point.payload or {}).get("source_types", [])),
+            }
+            merges[claim_id] = {
+                "mention_count": current["mention_count"] + len(cluster),
+                "last_seen_ts": now_iso(),
+                "last_seen": now_epoch(),
+                "source_types": uniq_list(current["source_types"] + source_types),
+            }
+            for member in cluster:
+                results[member] = (claim_id, True)
+                events.append((claim_id, "merge", 0.0, "claim merged", None, None))
+            continue
+
+        claim_id = str(uuid.uuid4())
+        claim_text, embedding, _ = batch[cluster[0]]
+        creates.append(
+            {
+                "id": claim_id,
+                "vectors": {"text_dense": embedding},
+                "payload": _new_claim_payload(claim_id, claim_text, source_types, len(cluster)),
+            }
+        )
+        results[cluster[0]] = (claim_id, False)
+        events.append((claim_id, "create", 0.0, "new canonical claim", None, None))
+        for member in cluster[1:]:
+            results[member] = (claim_id, True)
+            events.append((claim_id, "merge", 0.0, "claim merged", None, None))
+
+    if creates:
+        sparse_vectors = get_sparse_embedder().embed(
+            [point["payload"]["claim_text"] for point in creates]
+        )
+        for point, sparse in zip(creates, sparse_vectors):
+            point["vectors"]["text_sparse"] = sparse
+        upsert_points(CLAIMS_COLLECTION, creates)
+    update_payloads(CLAIMS_COLLECTION, merges)
+    upsert_claim_states(
+        {**{point["id"]: point["payload"] for point in creates}, **merges}
+    )
+    mark_claims_dirty([point["id"] for point in creates], "create")
+    mark_claims_dirty(merges, "merge")
+    log_events(events)
+    return results
+
+
+def canonicalize_claim(
+    claim_text: str,
+    embedding: List[float],
+    source_type: str,
+) -> Tuple[str, bool]:
+    return canonicalize_claims([(claim_text, embedding, source_type)])[0]
@@ -1,31 +1,55 @@
-from datetime import datetime, timedelta
+import numpy as np
+from qdrant_client.http import models
 
 from core.config import settings
+from core.utils import now_epoch
 from qdrant_store.collections import CLAIMS_COLLECTION
-from qdrant_store.crud import scroll_points, update_payload
-from memory.events import log_event
+from qdrant_store.crud import scroll_points, update_payloads
+from memory.events import log_events
+from storage.claim_state import upsert_claim_states
+from storage.dirty_claims import mark_claims_dirty
+from storage.query_cache import bump_corpus_version
 
 
-def apply_decay() -> int:
-    decay_before = datetime.utcnow() - timedelta(days=settings.decay_days)
-    decay_before_iso = decay_before.isoformat() + "Z"
+DECAY_RATE = 0.1
+
+
+def apply_decay(batch_size: int = 256) -> int:
+    cutoff = now_epoch() - settings.decay_days * 86400
+    stale_filter = models.Filter(
+        must=[models.FieldCondition(key="last_seen", range=models.Range(lt=cutoff))]
+    )
     updated = 0
     offset = None
     while True:
-        points, next_offset = scroll_points(CLAIMS_COLLECTION, limit=50, offset=offset)
-        for point in points:
-            last_seen = point.payload.get("last_seen_ts", "")
-            if last_seen and last_seen < decay_before_iso:
-                current = float(point.payload.get("confidence", 0.5))
-                new_conf = current + (0.5 - current) * 0.1
-                update_payload(
-                    CLAIMS_COLLECTION,
-                    point.id,
-                    {"confidence": new_conf},
-                )
-                log_event(str(point.id), "decay", new_conf - current, "decay toward neutral")
-                updated += 1
+        points, next_offset = scroll_points(
+            CLAIMS_COLLECTION,
+            limit=batch_size,
+            offset=offset,
+            filters=stale_filter,
+            payload_fields=["confidence"],
+        )
+        if points:
+            current = np.array(
+                [float((point.payload or {}).get("confidence", 0.5)) for point in points]
+            )
+            new_conf = current + (0.5 - current) * DECAY_RATE
+            updates = {
+                str(point.id): {"confidence": float(conf)} for point, conf in zip(points, new_conf)
+            }
+            update_payloads(CLAIMS_COLLECTION, updates)
+            upsert_claim_states(updates)
+            mark_claims_dirty(updates, "decay")
+            log_events(
+                [
+                    (str(point.id), "decay", float(delta), "decay toward neutral", None, None)
+                    for point, delta in zip(points, new_conf - current)
+                ]
+            )
+            updated += len(points)
         if next_offset is None:
             break
         offset = next_offset
+    if updated:
+        bump_corpus_version()
     return updated
@@ -1,7 +1,53 @@
-from typing import Optional
+import atexit
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+from core.config import settings
 from core.utils import now_iso
-from storage.sqlite import get_connection
+from storage.sqlite import read_connection, temp_id_table, write_connection
+
+
+EventRow = Tuple[str, str, float, str, Optional[str], Optional[str]]
+
+_INSERT_EVENT = """
+    INSERT INTO events (timestamp, claim_id, event_type, delta, reason, source_id, agent_name)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+
+class EventBuffer:
+    def __init__(self, max_size: int, flush_interval: float) -> None:
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._rows: List[tuple] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def add(self, rows: List[EventRow]) -> None:
+        timestamp = now_iso()
+        with self._lock:
+            self._rows.extend((timestamp, *row) for row in rows)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if len(self._rows) >= self.max_size or due:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._rows:
+            return
+        with write_connection() as conn:
+            conn.executemany(_INSERT_EVENT, self._rows)
+        self._rows = []
+
+
+_buffer = EventBuffer(settings.event_buffer_size, settings.event_flush_seconds)
+atexit.register(_buffer.flush)
 
 
 def log_event(
@@ -12,14 +58,94 @@ def log_event(
     source_id: Optional[str] = None,
     agent_name: Optional[str] = None,
 ) -> None:
-    conn = get_connection()
-    statement = """
-        INSERT INTO events (timestamp, claim_id, event_type, delta, reason, source_id, agent_name)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+    log_events([(claim_id, event_type, delta, reason, source_id, agent_name)])
+
+
+def log_events(rows: List[EventRow]) -> None:
+    if rows:
+        _buffer.add(rows)
+
+
+def flush_events() -> None:
+    # Events are buffered; call this before querying the events table.
+    _buffer.flush()
+
+
+def count_events(claim_id: str, event_types: Sequence[str], since_iso: str) -> int:
+    # Raw rows newer than the cutoff plus compacted daily rollups from the cutoff day on.
+    flush_events()
+    placeholders = ",".join("?" for _ in event_types)
+    with read_connection() as conn:
+        row = conn.execute(
+            f"""
+            SELECT
+                (SELECT COUNT(*) FROM events
+                 WHERE claim_id = ? AND event_type IN ({placeholders}) AND timestamp >= ?)
+                +
+                (SELECT COALESCE(SUM(event_count), 0) FROM event_rollups
+                 WHERE claim_id = ? AND event_type IN ({placeholders}) AND day >= ?)
+                AS cnt
+            """,
+            (claim_id, *event_types, since_iso, claim_id, *event_types, since_iso[:10]),
+        ).fetchone()
+    return int(row["cnt"] if row else 0)
+
+
+def count_events_by_claim(
+    claim_ids: Iterable[str], event_types: Sequence[str], since_iso: str
+) -> Dict[str, int]:
+    # count_events for a whole set of claims in one pass over a temp id table.
+    flush_events()
+    placeholders = ",".join("?" for _ in event_types)
+    with read_connection() as conn, temp_id_table(conn, claim_ids, "event_claim_ids") as ids:
+        rows = conn.execute(
+            f"""
+            SELECT claim_id, SUM(cnt) AS cnt FROM (
+                SELECT events.claim_id AS claim_id, COUNT(*) AS cnt
+                FROM {ids} AS ids JOIN events ON events.claim_id = ids.id
+                WHERE events.event_type IN ({placeholders}) AND events.timestamp >= ?
+                GROUP BY events.claim_id
+                UNION ALL
+                SELECT event_rollups.claim_id AS claim_id, SUM(event_rollups.event_count) AS cnt
+                FROM {ids} AS ids JOIN event_rollups ON event_rollups.claim_id = ids.id
+                WHERE event_rollups.event_type IN ({placeholders}) AND event_rollups.day >= ?
+                GROUP BY event_rollups.claim_id
+            )
+            GROUP BY claim_id
+            """,
+            (*event_types, since_iso, *event_types, since_iso[:10]),
+        ).fetchall()
+    return {row["claim_id"]: int(row["cnt"] or 0) for row in rows}
+
+
+def compact_events(retention_days: Optional[int] = None, batch_size: int = 5000) -> int:
+    days = settings.event_retention_days if retention_days is None else retention_days
+    cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat() + "Z"
+    batch = """
+        SELECT rowid FROM events WHERE timestamp < ?
+        ORDER BY timestamp, rowid LIMIT ?
         """
-    params = (now_iso(), claim_id, event_type, delta, reason, source_id, agent_name)
-    if conn.in_transaction:
-        conn.execute(statement, params)
-    else:
-        with conn:
-            conn.execute(statement, params)
+    flush_events()
+    compacted = 0
+    while True:
+        with write_connection() as conn:
+            conn.execute(
+                f"""
+                INSERT INTO event_rollups (day, claim_id, event_type, event_count, delta_sum)
+                SELECT substr(timestamp, 1, 10), claim_id, event_type, COUNT(*), COALESCE(SUM(delta), 0)
+                FROM events
+                WHERE rowid IN ({batch})
+                GROUP BY substr(timestamp, 1, 10), claim_id, event_type
+                ON CONFLICT (claim_id, event_type, day) DO UPDATE SET
+                    event_count = event_count + excluded.event_count,
+                    delta_sum = delta_sum + excluded.delta_sum
+                """,
+                (cutoff, batch_size),
+            )
+            deleted = conn.execute(
+                f"DELETE FROM events WHERE rowid IN ({batch})", (cutoff, batch_size)
+            ).rowcount
+        compacted += deleted
+        if deleted < batch_size:
+            break
+    return compacted
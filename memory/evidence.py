@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from qdrant_client.http import models
+
+from core.utils import iso_to_epoch, now_epoch, uniq_list
+from models.stance_classifier import classify_stance
+from qdrant_store.collections import CLAIMS_COLLECTION, EVIDENCE_COLLECTION
+from qdrant_store.crud import count_points, get_points, scroll_points, update_payloads
+from storage.dirty_claims import mark_claims_dirty
+from storage.query_cache import bump_corpus_version
+
+
+# Evidence written before stances were indexed lacks stance_pending=False;
+# points leave this filter as soon as the backfill labels them.
+PENDING_STANCE_FILTER = models.Filter(
+    must_not=[models.FieldCondition(key="stance_pending", match=models.MatchValue(value=False))]
+)
+
+
+def evidence_claim_filter(claim_ids: List[str]) -> models.Filter:
+    return models.Filter(
+        must=[models.FieldCondition(key="claim_ids", match=models.MatchAny(any=list(claim_ids)))]
+    )
+
+
+def evidence_stance(payload: Optional[Dict[str, Any]], claim_id: str) -> Optional[str]:
+    stances = (payload or {}).get("stances") or {}
+    return stances.get(str(claim_id))
+
+
+def stance_key(claim_id: str, stance: str) -> str:
+    return f"{claim_id}:{stance}"
+
+
+def evidence_stance_fields(stances: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "stances": dict(stances),
+        "claim_stances": sorted(stance_key(cid, stance) for cid, stance in stances.items()),
+        "stance_pending": False,
+    }
+
+
+def evidence_stance_filter(
+    claim_id: str, stance: str, since_epoch: Optional[float] = None
+) -> models.Filter:
+    conditions: List[models.FieldCondition] = [
+        models.FieldCondition(
+            key="claim_stances", match=models.MatchValue(value=stance_key(claim_id, stance))
+        )
+    ]
+    if since_epoch is not None:
+        conditions.append(models.FieldCondition(key="ts", range=models.Range(gte=since_epoch)))
+    return models.Filter(must=conditions)
+
+
+def count_evidence_stances(
+    claim_id: str,
+    since_epoch: Optional[float] = None,
+    stances: Tuple[str, ...] = ("support", "contradict"),
+) -> Dict[str, int]:
+    return {
+        stance: count_points(
+            EVIDENCE_COLLECTION, filters=evidence_stance_filter(claim_id, stance, since_epoch)
+        )
+        for stance in stances
+    }
+
+
+def backfill_evidence_stances(batch_size: int = 64, max_batches: Optional[int] = None) -> int:
+    # Labels evidence missing a stance for any linked claim and fills the
+    # indexed ts / claim_stances fields. Each pass restarts from the top because
+    # every scanned point leaves PENDING_STANCE_FILTER.
+    updated = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        points, _ = scroll_points(
+            EVIDENCE_COLLECTION,
+            limit=batch_size,
+            filters=PENDING_STANCE_FILTER,
+            payload_fields=["claim_ids", "stances", "snippet_text", "timestamp", "ts"],
+        )
+        if not points:
+            break
+        batches += 1
+
+        missing_ids = uniq_list(
+            str(claim_id)
+            for point in points
+            for claim_id in (point.payload or {}).get("claim_ids") or []
+            if not evidence_stance(point.payload, claim_id)
+        )
+        claim_texts = {
+            str(claim.id): (claim.payload or {}).get("claim_text", "")
+            for claim in get_points(CLAIMS_COLLECTION, missing_ids, payload_fields=["claim_text"])
+        }
+
+        payloads: Dict[str, Dict[str, Any]] = {}
+        relabelled: List[str] = []
+        for point in points:
+            payload = point.payload or {}
+            stances = {str(cid): stance for cid, stance in (payload.get("stances") or {}).items()}
+            snippet = payload.get("snippet_text", "")
+            for claim_id in payload.get("claim_ids") or []:
+                claim_id = str(claim_id)
+                if claim_id not in stances:
+                    stances[claim_id] = classify_stance(snippet, claim_texts.get(claim_id, ""))
+                    relabelled.append(claim_id)
+            fields = evidence_stance_fields(stances)
+            if payload.get("ts") is None:
+                fields["ts"] = iso_to_epoch(payload.get("timestamp")) or now_epoch()
+            payloads[str(point.id)] = fields
+        update_payloads(EVIDENCE_COLLECTION, payloads)
+        mark_claims_dirty(relabelled, "evidence")
+        updated += len(payloads)
+    if updated:
+        bump_corpus_version()
+    return updated
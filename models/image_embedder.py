@@ -1,3 +1,4 @@
+import threading
 from typing import List
 
 import numpy as np
@@ -23,10 +24,12 @@ class ImageEmbedder:
 
 
 _embedder = None
+_embedder_lock = threading.Lock()
 
 
 def get_image_embedder() -> ImageEmbedder:
     global _embedder
-    if _embedder is None:
-        _embedder = ImageEmbedder()
+    with _embedder_lock:
+        if _embedder is None:
+            _embedder = ImageEmbedder()
     return _embedder
@@ -0,0 +1,67 @@
+from collections import Counter
+from typing import Dict, List
+import re
+import threading
+import zlib
+
+
+TOKEN_PATTERN = re.compile(r"[#@]?\w+(?:[.,:/]\d+)*")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was",
+    "were", "will", "with",
+}
+
+
+# Only the term-frequency half of BM25 is computed locally; the sparse vectors are
+# configured with Modifier.IDF so Qdrant applies corpus IDF at query time.
+class SparseEmbedder:
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_doc_len: float = 64.0) -> None:
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_len = avg_doc_len
+
+    def tokenize(self, text: str) -> List[str]:
+        tokens = []
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            if token in STOPWORDS:
+                continue
+            tokens.append(token)
+            if token[0] in "#@" and len(token) > 1:
+                tokens.append(token[1:])
+        return tokens
+
+    def _index(self, token: str) -> int:
+        return zlib.crc32(token.encode("utf-8"))
+
+    def embed(self, texts: List[str]) -> List[Dict[str, List]]:
+        vectors = []
+        for text in texts:
+            tokens = self.tokenize(text)
+            norm = self.k1 * (1 - self.b + self.b * len(tokens) / self.avg_doc_len)
+            weights: Dict[int, float] = {}
+            for token, tf in Counter(tokens).items():
+                index = self._index(token)
+                weights[index] = weights.get(index, 0.0) + tf * (self.k1 + 1) / (tf + norm)
+            vectors.append({"indices": list(weights), "values": list(weights.values())})
+        return vectors
+
+    def embed_query(self, texts: List[str]) -> List[Dict[str, List]]:
+        vectors = []
+        for text in texts:
+            indices = sorted({self._index(token) for token in self.tokenize(text)})
+            vectors.append({"indices": indices, "values": [1.0] * len(indices)})
+        return vectors
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_sparse_embedder() -> SparseEmbedder:
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            _embedder = SparseEmbedder()
+    return _embedder
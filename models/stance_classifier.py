@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Dict, Literal, Tuple
+from typing import Dict, List, Literal, Tuple
 import os
 import re
 
@@ -88,6 +88,67 @@ def _nli_stance(snippet: str, claim: str) -> Tuple[Stance, Dict[str, float]]:
     return stance, scores
 
 
+def _nli_stances(pairs: List[Tuple[str, str]], batch_size: int = 16) -> List[Tuple[Stance, Dict[str, float]]]:
+    classifier = _get_nli_pipeline()
+    results = classifier(
+        [{"text": snippet, "text_pair": claim} for snippet, claim in pairs],
+        top_k=None,
+        truncation=True,
+        batch_size=batch_size,
+    )
+    stances = []
+    for result in results:
+        if isinstance(result, dict):
+            result = [result]
+        scores = _normalize_nli_scores(result or [])
+        stances.append((max(scores, key=scores.get), scores))
+    return stances
+
+
+def _fixed_scores(stance: Stance) -> Dict[str, float]:
+    scores = {"support": 0.0, "contradict": 0.0, "mention": 0.0}
+    scores[stance] = 1.0
+    return scores
+
+
+def _single_nli_or_rules(snippet: str, claim: str) -> Tuple[Stance, Dict[str, float]]:
+    try:
+        return _nli_stance(snippet, claim)
+    except Exception:
+        stance = _rule_based_stance(snippet, claim)
+        return stance, _fixed_scores(stance)
+
+
+def classify_stances_with_scores(
+    pairs: List[Tuple[str, str]],
+) -> List[Tuple[Stance, Dict[str, float]]]:
+    # Batched classify_stance_with_scores over (snippet, claim) pairs: same Ollama
+    # first / NLI / rule-based cascade, but the NLI pass runs as one pipeline call.
+    results: List = [None] * len(pairs)
+    pending: List[int] = []
+    for index, (snippet, claim) in enumerate(pairs):
+        if not snippet.strip() or not claim.strip():
+            results[index] = ("mention", _fixed_scores("mention"))
+            continue
+        if settings.use_ollama:
+            try:
+                stance = _ollama_stance(snippet, claim)
+                if stance in {"support", "contradict"}:
+                    results[index] = (stance, _fixed_scores(stance))
+                    continue
+            except Exception:
+                pass
+        pending.append(index)
+    if pending:
+        try:
+            nli_results = _nli_stances([pairs[index] for index in pending])
+        except Exception:
+            nli_results = [_single_nli_or_rules(*pairs[index]) for index in pending]
+        for index, result in zip(pending, nli_results):
+            results[index] = result
+    return results
+
+
 def classify_stance_with_scores(snippet: str, claim: str) -> Tuple[Stance, Dict[str, float]]:
     if not snippet.strip() or not claim.strip():
         return "mention", {"support": 0.0, "contradict": 0.0, "mention": 1.0}
@@ -1,3 +1,4 @@
+import threading
 from typing import List
 
 import numpy as np
@@ -16,10 +17,14 @@ class TextEmbedder:
 
 
 _embedder = None
+_embedder_lock = threading.Lock()
 
 
 def get_text_embedder() -> TextEmbedder:
     global _embedder
-    if _embedder is None:
-        _embedder = TextEmbedder()
+    # Callers on concurrent threads (Analyze Meme branches, the retrieval server)
+    # must not load the model twice or see a half-built embedder.
+    with _embedder_lock:
+        if _embedder is None:
+            _embedder = TextEmbedder()
     return _embedder
@@ -0,0 +1,172 @@
+from typing import Any, Dict, List, Optional, Union
+
+from qdrant_client.http import models
+
+from qdrant_store.client import get_async_client
+from qdrant_store.crud import (
+    _coerce_filter,
+    _hybrid_prefetch,
+    _payload_selector,
+    _point_structs,
+    _query_requests,
+    _set_payload_ops,
+)
+
+
+async def upsert_point(
+    collection: str, point_id: str, vectors: Dict[str, List[float]], payload: Dict[str, Any]
+) -> None:
+    await upsert_points(collection, [{"id": point_id, "vectors": vectors, "payload": payload}])
+
+
+async def upsert_points(collection: str, points: List[Dict[str, Any]]) -> None:
+    if not points:
+        return
+    client = get_async_client()
+    await client.upsert(collection_name=collection, points=_point_structs(points))
+
+
+async def update_payload(collection: str, point_id: str, payload: Dict[str, Any]) -> None:
+    client = get_async_client()
+    await client.set_payload(collection_name=collection, payload=payload, points=[point_id])
+
+
+async def update_payloads(collection: str, payloads: Dict[str, Dict[str, Any]]) -> None:
+    if not payloads:
+        return
+    client = get_async_client()
+    await client.batch_update_points(
+        collection_name=collection, update_operations=_set_payload_ops(payloads)
+    )
+
+
+async def get_point(
+    collection: str,
+    point_id: str,
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+):
+    result = await get_points(collection, [point_id], payload_fields, exclude_fields, with_vectors)
+    return result[0] if result else None
+
+
+async def get_points(
+    collection: str,
+    point_ids: List[str],
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+) -> List[models.Record]:
+    if not point_ids:
+        return []
+    client = get_async_client()
+    return await client.retrieve(
+        collection_name=collection,
+        ids=point_ids,
+        with_payload=_payload_selector(payload_fields, exclude_fields),
+        with_vectors=with_vectors,
+    )
+
+
+async def search_vectors(
+    collection: str,
+    vector_name: str,
+    vector: List[float],
+    limit: int = 5,
+    filters: Optional[Union[models.Filter, Dict[str, Any]]] = None,
+    sparse_vector_name: Optional[str] = None,
+    sparse_vector: Optional[Dict[str, List]] = None,
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+) -> List[models.ScoredPoint]:
+    client = get_async_client()
+    filters = _coerce_filter(filters)
+    with_payload = _payload_selector(payload_fields, exclude_fields)
+    if sparse_vector_name and sparse_vector is not None:
+        response = await client.query_points(
+            collection_name=collection,
+            prefetch=_hybrid_prefetch(
+                vector_name, vector, sparse_vector_name, sparse_vector, limit, filters
+            ),
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            limit=limit,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+        )
+        return response.points
+    response = await client.query_points(
+        collection_name=collection,
+        query=vector,
+        using=vector_name,
+        limit=limit,
+        query_filter=filters,
+        with_payload=with_payload,
+        with_vectors=with_vectors,
+    )
+    return response.points
+
+
+async def search_vectors_batch(
+    collection: str,
+    vector_name: str,
+    vectors: List[List[float]],
+    limit: int = 5,
+    filters: Optional[Union[models.Filter, Dict[str, Any], List[Any]]] = None,
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    sparse_vector_name: Optional[str] = None,
+    sparse_vectors: Optional[List[Dict[str, List]]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+) -> List[List[models.ScoredPoint]]:
+    if not vectors:
+        return []
+    client = get_async_client()
+    responses = await client.query_batch_points(
+        collection_name=collection,
+        requests=_query_requests(
+            vector_name,
+            vectors,
+            limit,
+            filters,
+            payload_fields,
+            exclude_fields,
+            sparse_vector_name,
+            sparse_vectors,
+            with_vectors,
+        ),
+    )
+    return [response.points for response in responses]
+
+
+async def scroll_points(
+    collection: str,
+    limit: int = 100,
+    offset: Optional[int] = None,
+    filters: Optional[Union[models.Filter, Dict[str, Any]]] = None,
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+):
+    client = get_async_client()
+    return await client.scroll(
+        collection_name=collection,
+        scroll_filter=_coerce_filter(filters),
+        limit=limit,
+        offset=offset,
+        with_payload=_payload_selector(payload_fields, exclude_fields),
+        with_vectors=with_vectors,
+    )
+
+
+async def count_points(
+    collection: str,
+    filters: Optional[Union[models.Filter, Dict[str, Any]]] = None,
+    exact: bool = True,
+) -> int:
+    client = get_async_client()
+    result = await client.count(
+        collection_name=collection, count_filter=_coerce_filter(filters), exact=exact
+    )
+    return int(result.count)
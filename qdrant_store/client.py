@@ -1,13 +1,54 @@
-from qdrant_client import QdrantClient
+import asyncio
+import threading
+from typing import Any, Awaitable, Dict, TypeVar
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
 
 from core.config import settings
 
 
+T = TypeVar("T")
+
 _client = None
+_async_client = None
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _client_kwargs() -> Dict[str, Any]:
+    return {
+        "url": settings.qdrant_url,
+        "api_key": settings.qdrant_api_key,
+        "prefer_grpc": settings.qdrant_prefer_grpc,
+        "grpc_port": settings.qdrant_grpc_port,
+    }
 
 
 def get_client() -> QdrantClient:
     global _client
     if _client is None:
-        _client = QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+        _client = QdrantClient(**_client_kwargs())
     return _client
+
+
+def get_async_client() -> AsyncQdrantClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncQdrantClient(**_client_kwargs())
+    return _async_client
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name="qdrant-async", daemon=True)
+            thread.start()
+        return _loop
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    # The async client's connections are bound to the loop that first used them,
+    # so synchronous callers share one long-lived loop instead of asyncio.run().
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
@@ -10,6 +10,24 @@ CLAIMS_COLLECTION = "claims"
 EVIDENCE_COLLECTION = "evidence_snippets"
 MEDIA_COLLECTION = "media_memes"
 
+SPARSE_VECTORS = {
+    CLAIMS_COLLECTION: {"text_sparse": models.SparseVectorParams(modifier=models.Modifier.IDF)},
+    EVIDENCE_COLLECTION: {"snippet_sparse": models.SparseVectorParams(modifier=models.Modifier.IDF)},
+}
+
+PAYLOAD_INDEXES = {
+    CLAIMS_COLLECTION: {
+        "last_seen": models.PayloadSchemaType.FLOAT,
+    },
+    EVIDENCE_COLLECTION: {
+        "claim_ids": models.PayloadSchemaType.KEYWORD,
+        "claim_stances": models.PayloadSchemaType.KEYWORD,
+        "source_id": models.PayloadSchemaType.KEYWORD,
+        "stance_pending": models.PayloadSchemaType.BOOL,
+        "ts": models.PayloadSchemaType.FLOAT,
+    },
+}
+
 
 def ensure_collections() -> None:
     client = get_client()
@@ -23,6 +41,7 @@ def ensure_collections() -> None:
             vectors_config={
                 "text_dense": models.VectorParams(size=text_dim, distance=models.Distance.COSINE)
             },
+            sparse_vectors_config=SPARSE_VECTORS[CLAIMS_COLLECTION],
         )
 
     if EVIDENCE_COLLECTION not in collections:
@@ -31,6 +50,7 @@ def ensure_collections() -> None:
             vectors_config={
                 "snippet_dense": models.VectorParams(size=text_dim, distance=models.Distance.COSINE)
             },
+            sparse_vectors_config=SPARSE_VECTORS[EVIDENCE_COLLECTION],
         )
 
     if MEDIA_COLLECTION not in collections:
@@ -42,6 +62,21 @@ def ensure_collections() -> None:
             },
         )
 
+    ensure_payload_indexes()
+
+
+def ensure_payload_indexes() -> None:
+    client = get_client()
+    for collection, fields in PAYLOAD_INDEXES.items():
+        existing = client.get_collection(collection_name=collection).payload_schema or {}
+        for field_name, schema in fields.items():
+            if field_name not in existing:
+                client.create_payload_index(
+                    collection_name=collection,
+                    field_name=field_name,
+                    field_schema=schema,
+                )
+
 
 def reset_collections() -> None:
     client = get_client()
@@ -1,16 +1,136 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from qdrant_client.http import models
 
 from qdrant_store.client import get_client
 
 
+def _coerce_filter(
+    filters: Optional[Union[models.Filter, Dict[str, Any]]],
+) -> Optional[models.Filter]:
+    if filters is None or isinstance(filters, models.Filter):
+        return filters
+    if hasattr(models.Filter, "model_validate"):
+        return models.Filter.model_validate(filters)
+    return models.Filter.parse_obj(filters)
+
+
+def _payload_selector(
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+) -> Union[bool, models.PayloadSelectorInclude, models.PayloadSelectorExclude]:
+    if payload_fields is not None:
+        return models.PayloadSelectorInclude(include=list(payload_fields))
+    if exclude_fields:
+        return models.PayloadSelectorExclude(exclude=list(exclude_fields))
+    return True
+
+
+def _set_payload_ops(payloads: Dict[str, Dict[str, Any]]) -> List[models.SetPayloadOperation]:
+    return [
+        models.SetPayloadOperation(
+            set_payload=models.SetPayload(payload=payload, points=[point_id])
+        )
+        for point_id, payload in payloads.items()
+    ]
+
+
+def _query_requests(
+    vector_name: str,
+    vectors: List[List[float]],
+    limit: int,
+    filters: Optional[Union[models.Filter, Dict[str, Any], List[Any]]],
+    payload_fields: Optional[List[str]],
+    exclude_fields: Optional[List[str]],
+    sparse_vector_name: Optional[str] = None,
+    sparse_vectors: Optional[List[Dict[str, List]]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+) -> List[models.QueryRequest]:
+    # filters is either shared by every request or a list with one per vector.
+    with_payload = _payload_selector(payload_fields, exclude_fields)
+    if isinstance(filters, list):
+        request_filters = [_coerce_filter(item) for item in filters]
+    else:
+        request_filters = [_coerce_filter(filters)] * len(vectors)
+    requests = []
+    for index, (vector, request_filter) in enumerate(zip(vectors, request_filters)):
+        if sparse_vector_name and sparse_vectors is not None:
+            requests.append(
+                models.QueryRequest(
+                    prefetch=_hybrid_prefetch(
+                        vector_name,
+                        vector,
+                        sparse_vector_name,
+                        sparse_vectors[index],
+                        limit,
+                        request_filter,
+                    ),
+                    query=models.FusionQuery(fusion=models.Fusion.RRF),
+                    limit=limit,
+                    with_payload=with_payload,
+                    with_vector=with_vectors,
+                )
+            )
+        else:
+            requests.append(
+                models.QueryRequest(
+                    query=vector,
+                    using=vector_name,
+                    limit=limit,
+                    filter=request_filter,
+                    with_payload=with_payload,
+                    with_vector=with_vectors,
+                )
+            )
+    return requests
+
+
+def _to_vector(value: Any) -> Any:
+    if isinstance(value, dict) and "indices" in value:
+        return models.SparseVector(indices=value["indices"], values=value["values"])
+    return value
+
+
+def _point_structs(points: Iterable[Dict[str, Any]]) -> List[models.PointStruct]:
+    return [
+        models.PointStruct(
+            id=point["id"],
+            vector={name: _to_vector(value) for name, value in point["vectors"].items()},
+            payload=point["payload"],
+        )
+        for point in points
+    ]
+
+
+def _hybrid_prefetch(
+    vector_name: str,
+    vector: List[float],
+    sparse_vector_name: str,
+    sparse_vector: Dict[str, List],
+    limit: int,
+    filters: Optional[models.Filter],
+) -> List[models.Prefetch]:
+    prefetch_limit = max(limit * 4, 20)
+    return [
+        models.Prefetch(query=vector, using=vector_name, filter=filters, limit=prefetch_limit),
+        models.Prefetch(
+            query=_to_vector(sparse_vector),
+            using=sparse_vector_name,
+            filter=filters,
+            limit=prefetch_limit,
+        ),
+    ]
+
+
 def upsert_point(collection: str, point_id: str, vectors: Dict[str, List[float]], payload: Dict[str, Any]) -> None:
+    upsert_points(collection, [{"id": point_id, "vectors": vectors, "payload": payload}])
+
+
+def upsert_points(collection: str, points: List[Dict[str, Any]]) -> None:
+    if not points:
+        return
     client = get_client()
-    client.upsert(
-        collection_name=collection,
-        points=[models.PointStruct(id=point_id, vector=vectors, payload=payload)],
-    )
+    client.upsert(collection_name=collection, points=_point_structs(points))
 
 
 def update_payload(collection: str, point_id: str, payload: Dict[str, Any]) -> None:
@@ -18,25 +138,69 @@ def update_payload(collection: str, point_id: str, payload: Dict[str, Any]) -> N
     client.set_payload(collection_name=collection, payload=payload, points=[point_id])
 
 
-def get_point(collection: str, point_id: str):
+def update_payloads(collection: str, payloads: Dict[str, Dict[str, Any]]) -> None:
+    if not payloads:
+        return
     client = get_client()
-    result = client.retrieve(collection_name=collection, ids=[point_id], with_payload=True)
+    client.batch_update_points(collection_name=collection, update_operations=_set_payload_ops(payloads))
+
+
+def get_point(
+    collection: str,
+    point_id: str,
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+):
+    result = get_points(collection, [point_id], payload_fields, exclude_fields, with_vectors)
     return result[0] if result else None
 
 
+def get_points(
+    collection: str,
+    point_ids: List[str],
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+) -> List[models.Record]:
+    if not point_ids:
+        return []
+    client = get_client()
+    return client.retrieve(
+        collection_name=collection,
+        ids=point_ids,
+        with_payload=_payload_selector(payload_fields, exclude_fields),
+        with_vectors=with_vectors,
+    )
+
+
 def search_vectors(
     collection: str,
     vector_name: str,
     vector: List[float],
     limit: int = 5,
     filters: Optional[Union[models.Filter, Dict[str, Any]]] = None,
+    sparse_vector_name: Optional[str] = None,
+    sparse_vector: Optional[Dict[str, List]] = None,
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    with_vectors: Union[bool, List[str]] = False,
 ) -> List[models.ScoredPoint]:
     client = get_client()
-    if filters is not None and not isinstance(filters, models.Filter):
-        if hasattr(models.Filter, "model_validate"):
-            filters = models.Filter.model_validate(filters)
-        else:
-            filters = models.Filter.parse_obj(filters)
+    filters = _coerce_filter(filters)
+    with_payload = _payload_selector(payload_fields, exclude_fields)
+    if sparse_vector_name and sparse_vector is not None:
+        response = client.query_points(
+            collection_name=collection,
+            prefetch=_hybrid_prefetch(
+                vector_name, vector, sparse_vector_name, sparse_vector, limit, filters
+            ),
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            limit=limit,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+        )
+        return response.points
     if hasattr(client, "query_points"):
         response = client.query_points(
             collection_name=collection,
@@ -44,7 +208,8 @@ def search_vectors(
             using=vector_name,
             limit=limit,
             query_filter=filters,
-            with_payload=True,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
         )
         return response.points
     return client.search(
@@ -52,10 +217,70 @@ def search_vectors(
         query_vector=(vector_name, vector),
         limit=limit,
         query_filter=filters,
-        with_payload=True,
+        with_payload=with_payload,
+        with_vectors=with_vectors,
     )
 
 
-def scroll_points(collection: str, limit: int = 100, offset: Optional[int] = None):
+def search_vectors_batch(
+    collection: str,
+    vector_name: str,
+    vectors: List[List[float]],
+    limit: int = 5,
+    filters: Optional[Union[models.Filter, Dict[str, Any], List[Any]]] = None,
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    sparse_vector_name: Optional[str] = None,
+    sparse_vectors: Optional[List[Dict[str, List]]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+) -> List[List[models.ScoredPoint]]:
+    if not vectors:
+        return []
     client = get_client()
-    return client.scroll(collection_name=collection, limit=limit, offset=offset, with_payload=True)
+    responses = client.query_batch_points(
+        collection_name=collection,
+        requests=_query_requests(
+            vector_name,
+            vectors,
+            limit,
+            filters,
+            payload_fields,
+            exclude_fields,
+            sparse_vector_name,
+            sparse_vectors,
+            with_vectors,
+        ),
+    )
+    return [response.points for response in responses]
+
+
+def scroll_points(
+    collection: str,
+    limit: int = 100,
+    offset: Optional[int] = None,
+    filters: Optional[Union[models.Filter, Dict[str, Any]]] = None,
+    payload_fields: Optional[List[str]] = None,
+    exclude_fields: Optional[List[str]] = None,
+    with_vectors: Union[bool, List[str]] = False,
+):
+    client = get_client()
+    return client.scroll(
+        collection_name=collection,
+        scroll_filter=_coerce_filter(filters),
+        limit=limit,
+        offset=offset,
+        with_payload=_payload_selector(payload_fields, exclude_fields),
+        with_vectors=with_vectors,
+    )
+
+
+def count_points(
+    collection: str,
+    filters: Optional[Union[models.Filter, Dict[str, Any]]] = None,
+    exact: bool = True,
+) -> int:
+    client = get_client()
+    result = client.count(
+        collection_name=collection, count_filter=_coerce_filter(filters), exact=exact
+    )
+    return int(result.count)
@@ -0,0 +1,223 @@
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+from qdrant_client.http import models
+
+from core.utils import iso_to_epoch, now_epoch, uniq_list
+from memory.evidence import backfill_evidence_stances
+from qdrant_store.client import get_client
+from models.sparse_embedder import get_sparse_embedder
+from qdrant_store.collections import (
+    CLAIMS_COLLECTION,
+    EVIDENCE_COLLECTION,
+    ensure_collections,
+    ensure_payload_indexes,
+)
+from qdrant_store.crud import scroll_points, update_payloads, upsert_points
+
+
+SPARSE_SOURCES = {
+    CLAIMS_COLLECTION: ("text_sparse", "claim_text"),
+    EVIDENCE_COLLECTION: ("snippet_sparse", "snippet_text"),
+}
+
+_LEGACY_EVIDENCE_FILTER = models.Filter(
+    must_not=[models.IsEmptyCondition(is_empty=models.PayloadField(key="claim_id"))]
+)
+
+
+def _source_condition(source_id: Optional[Any]) -> models.Condition:
+    # MatchValue rejects None, so points without a source_id form one group.
+    if source_id is None:
+        return models.IsEmptyCondition(is_empty=models.PayloadField(key="source_id"))
+    return models.FieldCondition(key="source_id", match=models.MatchValue(value=source_id))
+
+
+def _legacy_evidence_for_source(source_id: Optional[Any], batch_size: int) -> List[models.Record]:
+    client = get_client()
+    query_filter = models.Filter(
+        must=[_source_condition(source_id)],
+        must_not=_LEGACY_EVIDENCE_FILTER.must_not,
+    )
+    records: List[models.Record] = []
+    offset = None
+    while True:
+        points, next_offset = client.scroll(
+            collection_name=EVIDENCE_COLLECTION,
+            scroll_filter=query_filter,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        records.extend(points)
+        if next_offset is None:
+            break
+        offset = next_offset
+    return records
+
+
+def _merge_legacy_group(records: List[models.Record]) -> Dict[str, Any]:
+    head = records[0]
+    payload = {
+        key: value
+        for key, value in (head.payload or {}).items()
+        if key not in {"claim_id", "stance"}
+    }
+    claim_ids = uniq_list(str(record.payload["claim_id"]) for record in records)
+    stances = {
+        str(record.payload["claim_id"]): record.payload["stance"]
+        for record in records
+        if record.payload.get("stance")
+    }
+    payload.update(
+        {"evidence_id": str(head.id), "claim_ids": claim_ids, "stances": stances}
+    )
+    return {"id": head.id, "vectors": head.vector, "payload": payload}
+
+
+def migrate_evidence_layout(batch_size: int = 256) -> Dict[str, int]:
+    # Legacy points carry a scalar claim_id/stance, one copy per linked claim.
+    # Copies sharing a source and snippet are folded into the first of them and
+    # the rest deleted, one source at a time so memory stays bounded.
+    client = get_client()
+    ensure_payload_indexes()
+    stats = {"sources": 0, "points_written": 0, "points_deleted": 0}
+    while True:
+        probe, _ = client.scroll(
+            collection_name=EVIDENCE_COLLECTION,
+            scroll_filter=_LEGACY_EVIDENCE_FILTER,
+            limit=1,
+            with_payload=["source_id"],
+        )
+        if not probe:
+            break
+        source_id = (probe[0].payload or {}).get("source_id")
+        records = _legacy_evidence_for_source(source_id, batch_size)
+        groups: Dict[str, List[models.Record]] = {}
+        for record in records:
+            groups.setdefault(record.payload.get("snippet_text", ""), []).append(record)
+
+        merged = [_merge_legacy_group(group) for group in groups.values()]
+        upsert_points(EVIDENCE_COLLECTION, merged)
+        kept = {str(point["id"]) for point in merged}
+        stale = [record.id for record in records if str(record.id) not in kept]
+        if stale:
+            client.delete(
+                collection_name=EVIDENCE_COLLECTION,
+                points_selector=models.PointIdsList(points=stale),
+            )
+        stats["sources"] += 1
+        stats["points_written"] += len(merged)
+        stats["points_deleted"] += len(stale)
+    return stats
+
+
+def _copy_points(
+    source: str,
+    target: str,
+    batch_size: int,
+    transform: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+) -> int:
+    client = get_client()
+    copied = 0
+    offset = None
+    while True:
+        points, next_offset = client.scroll(
+            collection_name=source,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        batch = [
+            {"id": point.id, "vectors": dict(point.vector or {}), "payload": point.payload or {}}
+            for point in points
+        ]
+        if transform is not None:
+            transform(batch)
+        upsert_points(target, batch)
+        copied += len(batch)
+        if next_offset is None:
+            break
+        offset = next_offset
+    return copied
+
+
+def add_sparse_vectors(batch_size: int = 256) -> Dict[str, int]:
+    # Qdrant cannot add a vector name to an existing collection, so collections
+    # created before hybrid search are copied to a staging collection, recreated
+    # with the sparse config and copied back with sparse vectors computed from
+    # the payload text. A leftover staging collection resumes an interrupted run.
+    client = get_client()
+    sparse_embedder = get_sparse_embedder()
+    stats: Dict[str, int] = {}
+    for collection, (vector_name, text_field) in SPARSE_SOURCES.items():
+        staging = f"{collection}__staging"
+        if not client.collection_exists(collection_name=collection):
+            # Interrupted between dropping the target and recreating it: the
+            # data only lives in staging, so recreate the target and copy back.
+            ensure_collections()
+            params = None
+        else:
+            params = client.get_collection(collection_name=collection).config.params
+        if params is not None and vector_name not in (params.sparse_vectors or {}):
+            if client.collection_exists(collection_name=staging):
+                client.delete_collection(collection_name=staging)
+            client.create_collection(collection_name=staging, vectors_config=params.vectors)
+            _copy_points(collection, staging, batch_size)
+            client.delete_collection(collection_name=collection)
+            ensure_collections()
+        if not client.collection_exists(collection_name=staging):
+            continue
+
+        def add_sparse(batch: List[Dict[str, Any]]) -> None:
+            texts = [str(point["payload"].get(text_field, "")) for point in batch]
+            for point, sparse in zip(batch, sparse_embedder.embed(texts)):
+                point["vectors"][vector_name] = sparse
+
+        stats[collection] = _copy_points(staging, collection, batch_size, add_sparse)
+        client.delete_collection(collection_name=staging)
+    return stats
+
+
+def backfill_last_seen(batch_size: int = 256) -> int:
+    # Claims written before the numeric last_seen field get it from last_seen_ts.
+    # Every scanned point leaves the filter, so each pass restarts from the top.
+    missing_filter = models.Filter(
+        must=[models.IsEmptyCondition(is_empty=models.PayloadField(key="last_seen"))]
+    )
+    updated = 0
+    while True:
+        points, _ = scroll_points(
+            CLAIMS_COLLECTION,
+            limit=batch_size,
+            filters=missing_filter,
+            payload_fields=["last_seen_ts"],
+        )
+        if not points:
+            break
+        update_payloads(
+            CLAIMS_COLLECTION,
+            {
+                str(point.id): {
+                    "last_seen": iso_to_epoch((point.payload or {}).get("last_seen_ts"))
+                    or now_epoch()
+                }
+                for point in points
+            },
+        )
+        updated += len(points)
+    return updated
+
+
+def main() -> None:
+    stats = migrate_evidence_layout()
+    print(f"evidence layout: {stats}")
+    print(f"sparse vectors: {add_sparse_vectors()}")
+    print(f"claims last_seen backfilled: {backfill_last_seen()}")
+    print(f"evidence stances backfilled: {backfill_evidence_stances()}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from PIL import Image
+
+from core.utils import clean_text
+from models.image_embedder import get_image_embedder
+from models.ocr import extract_text
+from models.text_embedder import get_text_embedder
+from qdrant_store import async_crud
+from qdrant_store.client import run_async
+from qdrant_store.collections import MEDIA_COLLECTION
+from retrieval.service import retrieve_by_claim_text
+
+
+MEME_LIMIT = 5
+MEME_HIT_FIELDS = [
+    "media_id",
+    "phash",
+    "timestamp",
+    "ocr_text",
+    "linked_claim_ids",
+    "source_id",
+]
+
+
+class StageTrace:
+    # Wall-clock start offset and duration of each stage, recorded from
+    # whichever thread runs it, so overlapping branches show up as overlaps.
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.stages: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str, branch: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.stages.append(
+                    {
+                        "stage": name,
+                        "branch": branch,
+                        "start_ms": round((started - self._started) * 1000, 1),
+                        "duration_ms": round((finished - started) * 1000, 1),
+                    }
+                )
+
+    def as_rows(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return sorted(self.stages, key=lambda row: row["start_ms"])
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._started) * 1000, 1)
+
+
+def _truncate_text(text: str, limit: int = 160) -> str:
+    cleaned = clean_text(text or "")
+    if len(cleaned) <= limit:
+        return cleaned
+    return f"{cleaned[:limit]}..."
+
+
+def meme_hit_rows(hits):
+    rows = []
+    for hit in hits:
+        payload = hit.payload or {}
+        rows.append(
+            {
+                "media_id": payload.get("media_id", str(hit.id)),
+                "score": round(hit.score, 4),
+                "phash": payload.get("phash", ""),
+                "timestamp": payload.get("timestamp", ""),
+                "ocr_preview": _truncate_text(payload.get("ocr_text", "")),
+                "linked_claim_ids": payload.get("linked_claim_ids", []),
+                "source_id": payload.get("source_id", ""),
+            }
+        )
+    return rows
+
+
+def _search_media(vector_name: str, vector: List[float]):
+    return run_async(
+        async_crud.search_vectors(
+            MEDIA_COLLECTION,
+            vector_name,
+            vector,
+            limit=MEME_LIMIT,
+            payload_fields=MEME_HIT_FIELDS,
+        )
+    )
+
+
+def _image_branch(image: Image.Image, trace: StageTrace):
+    with trace.stage("image_embed", "image"):
+        vector = get_image_embedder().embed([image])[0].tolist()
+    with trace.stage("image_search", "image"):
+        return _search_media("image_dense", vector)
+
+
+def _ocr_text_search(vector: List[float], trace: StageTrace):
+    with trace.stage("ocr_text_search", "ocr"):
+        return _search_media("ocr_text_dense", vector)
+
+
+def _claim_retrieval(ocr_text: str, vector: List[float], trace: StageTrace):
+    with trace.stage("claim_retrieval", "claims"):
+        return retrieve_by_claim_text(ocr_text, vector)
+
+
+def analyze_meme(image: Image.Image) -> Dict[str, Any]:
+    # OCR and the CLIP embed/search run side by side; once OCR text exists it is
+    # embedded once and the OCR similarity search and claim retrieval fan out as
+    # two more branches sharing that vector, so end-to-end latency tracks the
+    # slowest branch instead of the sum of stages.
+    trace = StageTrace()
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="meme") as pool:
+        image_future = pool.submit(_image_branch, image, trace)
+        with trace.stage("ocr", "ocr"):
+            ocr_text = clean_text(extract_text(image))
+        text_hits = []
+        claim_result = None
+        if ocr_text:
+            with trace.stage("ocr_text_embed", "ocr"):
+                text_vector = get_text_embedder().embed([ocr_text])[0].tolist()
+            text_future = pool.submit(_ocr_text_search, text_vector, trace)
+            claim_future = pool.submit(_claim_retrieval, ocr_text, text_vector, trace)
+            text_hits = text_future.result()
+            claim_result = claim_future.result()
+        image_hits = image_future.result()
+    return {
+        "ocr_text": ocr_text,
+        "image_hits": image_hits,
+        "text_hits": text_hits,
+        "claim_result": claim_result,
+        "trace": trace.as_rows(),
+        "total_ms": trace.elapsed_ms(),
+    }
@@ -0,0 +1,80 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+from core.config import settings
+from qdrant_store.collections import ensure_collections
+from retrieval.service import retrieve_many
+
+
+def _result_json(query: str, result) -> Dict[str, Any]:
+    claims, evidence, verdict = result
+    return {"query": query, "verdict": verdict, "claims": claims, "evidence": evidence}
+
+
+def _parse_queries(body: bytes) -> List[str]:
+    payload = json.loads(body or b"{}")
+    queries = payload.get("queries") if isinstance(payload, dict) else None
+    if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+        raise ValueError("expected {\"queries\": [\"...\", ...]}")
+    if len(queries) > settings.retrieval_max_batch:
+        raise ValueError(f"at most {settings.retrieval_max_batch} queries per request")
+    return queries
+
+
+class RetrievalHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if self.path != "/retrieve":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            queries = _parse_queries(self.rfile.read(length))
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        try:
+            # Blank queries keep their slot in the response but skip the search;
+            # repeated queries are retrieved once.
+            texts = list(dict.fromkeys(query for query in queries if query.strip()))
+            results = dict(zip(texts, retrieve_many(texts)))
+        except Exception as exc:
+            self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        empty = ([], {"support": [], "contradict": [], "mention": []}, None)
+        self._send_json(
+            200,
+            {"results": [_result_json(query, results.get(query, empty)) for query in queries]},
+        )
+
+
+def main() -> None:
+    ensure_collections()
+    server = ThreadingHTTPServer(
+        (settings.retrieval_http_host, settings.retrieval_http_port), RetrievalHandler
+    )
+    print(f"Retrieval service listening on {settings.retrieval_http_host}:{settings.retrieval_http_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core.config import settings
+from memory.evidence import evidence_claim_filter, evidence_stance
+from models.sparse_embedder import get_sparse_embedder
+from models.stance_classifier import classify_stances_with_scores
+from models.text_embedder import get_text_embedder
+from qdrant_store import async_crud
+from qdrant_store.client import run_async
+from qdrant_store.collections import CLAIMS_COLLECTION, EVIDENCE_COLLECTION
+from storage.query_cache import (
+    corpus_version,
+    get_cached_results,
+    normalize_query,
+    put_cached_results,
+)
+
+
+CLAIM_LIMIT = 5
+EVIDENCE_LIMIT = 20
+CLAIM_HIT_FIELDS = ["canonical_claim_id", "claim_text"]
+EVIDENCE_HIT_FIELDS = ["evidence_id", "snippet_text", "source_id", "stances"]
+NEGATION_PATTERN = re.compile(r"\b(?:not|no|never|none|nothing|nobody|neither|nor|cannot)\b|n't\b")
+
+
+# --------------------------------------------------
+# Verdict helpers
+# --------------------------------------------------
+def _init_verdict():
+    return {
+        "support_count": 0,
+        "contradict_count": 0,
+        "mention_count": 0,
+        "support_score": 0.0,
+        "contradict_score": 0.0,
+        "mention_score": 0.0,
+    }
+
+
+def _update_verdict(stats, stance, scores):
+    stats[f"{stance}_count"] += 1
+    for k in ["support", "contradict", "mention"]:
+        stats[f"{k}_score"] += scores.get(k, 0.0)
+
+
+def _finalize_verdict(stats):
+    s, c = stats["support_count"], stats["contradict_count"]
+
+    if s + c < 2:
+        label = "Inconclusive"
+    elif c > s:
+        label = "False (corpus-contradicted)"
+    elif s > c:
+        label = "True (corpus-supported)"
+    else:
+        label = "Mixed"
+
+    stats["label"] = label
+    return stats
+
+
+# --------------------------------------------------
+# Evidence handling
+# --------------------------------------------------
+def _evidence_id(ev) -> str:
+    payload = ev.payload or {}
+    return str(payload.get("evidence_id", ev.id))
+
+
+def _unique_evidence(evidence_hits) -> List[Tuple]:
+    # Claims share evidence, so the same snippet can come back under several hits;
+    # each is kept once with the index of the (best-ranked) claim hit it came from.
+    seen = set()
+    unique = []
+    for hit_index, ev_hits in enumerate(evidence_hits):
+        for ev in ev_hits:
+            eid = _evidence_id(ev)
+            if eid in seen:
+                continue
+            seen.add(eid)
+            unique.append((ev, hit_index))
+    return unique
+
+
+def _claim_similarity(vector, hit) -> float:
+    stored = hit.vector.get("text_dense") if isinstance(hit.vector, dict) else hit.vector
+    if not stored:
+        return 0.0
+    # Both sides are unit-normalized, so the dot product is the cosine.
+    return float(np.dot(vector, stored))
+
+
+def _negation_parity(text: str) -> int:
+    return len(NEGATION_PATTERN.findall(text.lower())) % 2
+
+
+def _reusable_stance(query: str, hit, similarity: float, ev):
+    # The stance stored on evidence was classified against the canonical claim;
+    # it only answers for the query when the two say the same thing. Paraphrases
+    # that flip polarity ("X is not Y") still embed close together, so a differing
+    # negation count always goes to NLI.
+    if similarity < settings.stance_reuse_threshold:
+        return None
+    claim_text = (hit.payload or {}).get("claim_text", "")
+    if _negation_parity(query) != _negation_parity(claim_text):
+        return None
+    return evidence_stance(ev.payload or {}, _hit_claim_id(hit))
+
+
+def _push_evidence(ev, stance, scores, stance_source, evidence, verdict):
+    payload = ev.payload or {}
+    _update_verdict(verdict, stance, scores)
+
+    evidence[stance].append(
+        {
+            "evidence_id": _evidence_id(ev),
+            "snippet_text": payload.get("snippet_text", ""),
+            "source_id": payload.get("source_id", ""),
+            "score": round(ev.score, 4),
+            "stance_score": round(scores.get(stance, 0.0), 4),
+            "stance_source": stance_source,
+        }
+    )
+
+
+def _hit_claim_id(hit):
+    payload = hit.payload or {}
+    return payload.get("canonical_claim_id", hit.id)
+
+
+def _hybrid_batch_kwargs(sparse_name: str, sparse_vectors) -> Dict[str, object]:
+    if not settings.hybrid_search or sparse_vectors is None:
+        return {}
+    return {"sparse_vector_name": sparse_name, "sparse_vectors": sparse_vectors}
+
+
+# --------------------------------------------------
+# Search
+# --------------------------------------------------
+async def search_claims_and_evidence_many(vectors, sparse_vectors=None):
+    # Two round trips for the whole batch: one query_batch_points for the claims,
+    # then one for every (query, matched claim) evidence lookup.
+    claim_hits = await async_crud.search_vectors_batch(
+        CLAIMS_COLLECTION,
+        "text_dense",
+        vectors,
+        limit=CLAIM_LIMIT,
+        payload_fields=CLAIM_HIT_FIELDS,
+        with_vectors=["text_dense"],
+        **_hybrid_batch_kwargs("text_sparse", sparse_vectors),
+    )
+
+    owners = []
+    ev_vectors = []
+    ev_sparse = []
+    ev_filters = []
+    for index, hits in enumerate(claim_hits):
+        for hit in hits:
+            owners.append(index)
+            ev_vectors.append(vectors[index])
+            ev_filters.append(evidence_claim_filter([str(_hit_claim_id(hit))]))
+            if sparse_vectors is not None:
+                ev_sparse.append(sparse_vectors[index])
+    flat_hits = await async_crud.search_vectors_batch(
+        EVIDENCE_COLLECTION,
+        "snippet_dense",
+        ev_vectors,
+        limit=EVIDENCE_LIMIT,
+        filters=ev_filters,
+        payload_fields=EVIDENCE_HIT_FIELDS,
+        **_hybrid_batch_kwargs("snippet_sparse", ev_sparse if sparse_vectors is not None else None),
+    )
+
+    evidence_hits = [[] for _ in vectors]
+    for index, hits in zip(owners, flat_hits):
+        evidence_hits[index].append(hits)
+    return list(zip(claim_hits, evidence_hits))
+
+
+# --------------------------------------------------
+# Results
+# --------------------------------------------------
+def build_claim_results_many(queries: List[str], vectors, searches) -> List[Tuple]:
+    # Evidence whose stored stance can stand in for the query skips NLI; the rest
+    # of the (snippet, query) pairs across the batch go through the classifier in
+    # one call so the NLI model sees full batches.
+    claim_rows = []
+    entries = []
+    pairs = []
+    for query, vector, (claim_hits, evidence_hits) in zip(queries, vectors, searches):
+        claim_rows.append(
+            [
+                {
+                    "claim_id": _hit_claim_id(hit),
+                    "claim_text": (hit.payload or {}).get("claim_text", ""),
+                    "score": round(hit.score, 4),
+                }
+                for hit in claim_hits
+            ]
+        )
+        similarities = [_claim_similarity(vector, hit) for hit in claim_hits]
+        query_entries = []
+        for ev, hit_index in _unique_evidence(evidence_hits):
+            stance = _reusable_stance(query, claim_hits[hit_index], similarities[hit_index], ev)
+            if stance in {"support", "contradict", "mention"}:
+                scores = {"support": 0.0, "contradict": 0.0, "mention": 0.0}
+                scores[stance] = 1.0
+                query_entries.append((ev, stance, scores, "stored"))
+            else:
+                query_entries.append((ev, None, None, "nli"))
+                pairs.append(((ev.payload or {}).get("snippet_text", ""), query))
+        entries.append(query_entries)
+    classified = iter(classify_stances_with_scores(pairs))
+
+    results = []
+    for rows, query_entries in zip(claim_rows, entries):
+        evidence = {"support": [], "contradict": [], "mention": []}
+        verdict = _init_verdict()
+        for ev, stance, scores, stance_source in query_entries:
+            if stance is None:
+                stance, scores = next(classified)
+            _push_evidence(ev, stance, scores, stance_source, evidence, verdict)
+        results.append((rows, evidence, _finalize_verdict(verdict)))
+    return results
+
+
+def _retrieve_uncached(queries: List[str], vectors=None) -> List[Tuple]:
+    if vectors is None:
+        vectors = [vector.tolist() for vector in get_text_embedder().embed(queries)]
+    sparse_vectors = get_sparse_embedder().embed_query(queries)
+    searches = run_async(search_claims_and_evidence_many(vectors, sparse_vectors))
+    return build_claim_results_many(queries, vectors, searches)
+
+
+def retrieve_many(queries: List[str], use_cache: bool = True, vectors=None) -> List[Tuple]:
+    # Results are cached per normalized query text and corpus version, so a
+    # repeated query is a single SQLite lookup until the next ingest/decay/reset.
+    # `vectors` are optional precomputed dense embeddings, one per query, for
+    # callers that already embedded the text.
+    if not queries:
+        return []
+    if not use_cache:
+        return _retrieve_uncached(queries, vectors)
+    version = corpus_version()
+    results = {
+        key: tuple(result) for key, result in get_cached_results(queries, version).items()
+    }
+    misses: Dict[str, int] = {}
+    for index, query in enumerate(queries):
+        key = normalize_query(query)
+        if key not in results and key not in misses:
+            misses[key] = index
+    if misses:
+        miss_queries = [queries[index] for index in misses.values()]
+        miss_vectors = None
+        if vectors is not None:
+            miss_vectors = [vectors[index] for index in misses.values()]
+        fresh = dict(zip(misses, _retrieve_uncached(miss_queries, miss_vectors)))
+        put_cached_results(fresh, version)
+        results.update(fresh)
+    return [results[normalize_query(query)] for query in queries]
+
+
+def retrieve_by_claim_text(query: str, vector=None):
+    return retrieve_many([query], vectors=[vector] if vector is not None else None)[0]
@@ -0,0 +1,64 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from core.utils import now_iso
+from storage.sqlite import read_connection, write_connection
+
+
+def record_agent_run(
+    agent_name: str,
+    mode: str,
+    started_ts: str,
+    summary: Dict[str, Any],
+    telemetry: Dict[str, Any],
+) -> None:
+    with write_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO agent_runs (
+                agent_name, mode, started_ts, finished_ts, duration_seconds,
+                claims_processed, summary_json, telemetry_json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                agent_name,
+                mode,
+                started_ts,
+                now_iso(),
+                float(telemetry.get("duration_seconds", 0.0)),
+                int(summary.get("claims_processed", 0)),
+                json.dumps(summary),
+                json.dumps(telemetry),
+            ),
+        )
+
+
+def recent_agent_runs(agent_name: str, limit: int = 50) -> List[Dict[str, Any]]:
+    # Oldest first, so callers can plot the history directly.
+    with read_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT run_id, mode, started_ts, duration_seconds, claims_processed,
+                summary_json, telemetry_json
+            FROM agent_runs
+            WHERE agent_name = ?
+            ORDER BY started_ts DESC
+            LIMIT ?
+            """,
+            (agent_name, limit),
+        ).fetchall()
+    runs = []
+    for row in reversed(rows):
+        run = dict(row)
+        run["summary"] = json.loads(run.pop("summary_json") or "{}")
+        run["telemetry"] = json.loads(run.pop("telemetry_json") or "{}")
+        runs.append(run)
+    return runs
+
+
+def prune_agent_runs(retention_days: int) -> int:
+    cutoff = (datetime.utcnow() - timedelta(days=retention_days)).isoformat() + "Z"
+    with write_connection() as conn:
+        cursor = conn.execute("DELETE FROM agent_runs WHERE started_ts < ?", (cutoff,))
+    return cursor.rowcount
@@ -1,30 +1,29 @@
 import json
 from typing import Any, Dict, Optional
 
-from storage.sqlite import get_connection
+from storage.sqlite import read_connection, write_connection
 
 
 def init_agent_state_table() -> None:
-    conn = get_connection()
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS agent_state (
-            agent_name TEXT PRIMARY KEY,
-            last_run_ts TEXT,
-            cursor TEXT,
-            extra_json TEXT
+    with write_connection() as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS agent_state (
+                agent_name TEXT PRIMARY KEY,
+                last_run_ts TEXT,
+                cursor TEXT,
+                extra_json TEXT
+            )
+            """
         )
-        """
-    )
-    conn.commit()
 
 
 def get_agent_state(agent_name: str) -> Optional[Dict[str, Any]]:
-    conn = get_connection()
-    row = conn.execute(
-        "SELECT agent_name, last_run_ts, cursor, extra_json FROM agent_state WHERE agent_name = ?",
-        (agent_name,),
-    ).fetchone()
+    with read_connection() as conn:
+        row = conn.execute(
+            "SELECT agent_name, last_run_ts, cursor, extra_json FROM agent_state WHERE agent_name = ?",
+            (agent_name,),
+        ).fetchone()
     if not row:
         return None
     extra_json = row["extra_json"]
@@ -48,7 +47,6 @@ def set_agent_state(
     cursor: Optional[str],
     extra_json: Optional[Any],
 ) -> None:
-    conn = get_connection()
     payload = None
     if extra_json is not None:
         payload = extra_json if isinstance(extra_json, str) else json.dumps(extra_json)
@@ -61,8 +59,5 @@ def set_agent_state(
             extra_json=excluded.extra_json
         """
     params = (agent_name, last_run_ts, cursor, payload)
-    if conn.in_transaction:
+    with write_connection() as conn:
         conn.execute(statement, params)
-    else:
-        with conn:
-            conn.execute(statement, params)
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+
+from core.utils import uniq_list
+from storage.sqlite import read_connection, temp_id_table, write_connection
+
+
+def window_start_day(days: int) -> str:
+    # A window of N days covers today's bucket and the N - 1 before it.
+    return (datetime.utcnow() - timedelta(days=days - 1)).date().isoformat()
+
+
+def link_claims(source_id: str, claim_ids: Iterable[str]) -> List[str]:
+    # Records source -> claim links and bumps the claim's mention bucket for the
+    # source's day once per newly linked claim. Returns the newly linked ids.
+    linked: List[str] = []
+    with write_connection() as conn:
+        row = conn.execute(
+            "SELECT timestamp FROM sources WHERE source_id = ?", (source_id,)
+        ).fetchone()
+        day = (row["timestamp"] if row and row["timestamp"] else datetime.utcnow().isoformat())[:10]
+        for claim_id in uniq_list(claim_ids):
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO claim_links (source_id, claim_id) VALUES (?, ?)",
+                (source_id, claim_id),
+            )
+            if cursor.rowcount:
+                linked.append(claim_id)
+        conn.executemany(
+            """
+            INSERT INTO claim_mention_buckets (claim_id, day, mentions) VALUES (?, ?, 1)
+            ON CONFLICT (claim_id, day) DO UPDATE SET mentions = mentions + 1
+            """,
+            [(claim_id, day) for claim_id in linked],
+        )
+    return linked
+
+
+def linked_source_claims(source_id: str, content_hash: str) -> List[str]:
+    # Claims already linked to this exact source content (same source_id and
+    # sources.text_hash), in link order. Lets a retried ingest resume without
+    # re-extracting and re-counting its claims.
+    with read_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT claim_links.claim_id FROM claim_links
+            JOIN sources ON sources.source_id = claim_links.source_id
+            WHERE claim_links.source_id = ? AND sources.text_hash = ?
+            ORDER BY claim_links.rowid
+            """,
+            (source_id, content_hash),
+        ).fetchall()
+    return [row["claim_id"] for row in rows]
+
+
+def mention_counts(claim_ids: Iterable[str], windows: Dict[str, int]) -> Dict[str, Dict[str, int]]:
+    # Sums of the last N daily buckets per claim for each named window, in one query.
+    names = list(windows)
+    sums = ", ".join(
+        f"SUM(CASE WHEN day >= ? THEN mentions ELSE 0 END) AS w{index}"
+        for index in range(len(names))
+    )
+    starts = [window_start_day(windows[name]) for name in names]
+    with read_connection() as conn, temp_id_table(conn, claim_ids, "mention_claim_ids") as ids:
+        rows = conn.execute(
+            f"""
+            SELECT claim_mention_buckets.claim_id AS claim_id, {sums}
+            FROM {ids} AS ids
+            JOIN claim_mention_buckets ON claim_mention_buckets.claim_id = ids.id
+            WHERE claim_mention_buckets.day >= ?
+            GROUP BY claim_mention_buckets.claim_id
+            """,
+            (*starts, min(starts)),
+        ).fetchall()
+    return {
+        row["claim_id"]: {name: int(row[f"w{index}"] or 0) for index, name in enumerate(names)}
+        for row in rows
+    }
+
+
+def prune_mention_buckets(keep_days: int) -> int:
+    with write_connection() as conn:
+        cursor = conn.execute(
+            "DELETE FROM claim_mention_buckets WHERE day < ?", (window_start_day(keep_days),)
+        )
+    return cursor.rowcount
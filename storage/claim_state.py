@@ -0,0 +1,133 @@
+import sys
+from typing import Any, Dict, List, Optional
+
+from qdrant_store.collections import CLAIMS_COLLECTION
+from qdrant_store.crud import scroll_points
+from storage.sqlite import read_connection, write_connection
+
+
+CLAIM_STATE_COLUMNS = [
+    "claim_text",
+    "status",
+    "confidence",
+    "trend_score",
+    "trend_1d",
+    "trend_30d",
+    "contradiction_ratio",
+    "volatility_score",
+    "meme_variant_count",
+    "alert_level",
+    "mention_count",
+    "support_count",
+    "contradict_count",
+    "last_seen_ts",
+    "last_agent_update_ts",
+]
+
+SORTABLE_COLUMNS = {
+    "trend_score",
+    "trend_1d",
+    "trend_30d",
+    "contradiction_ratio",
+    "volatility_score",
+    "confidence",
+    "last_agent_update_ts",
+}
+
+
+def upsert_claim_states(states: Dict[str, Dict[str, Any]]) -> None:
+    # Write-through mirror of claim payload fields; only the given columns change.
+    grouped: Dict[tuple, List[tuple]] = {}
+    for claim_id, fields in states.items():
+        columns = tuple(column for column in CLAIM_STATE_COLUMNS if column in fields)
+        if not columns:
+            continue
+        grouped.setdefault(columns, []).append(
+            (str(claim_id), *(fields[column] for column in columns))
+        )
+    if not grouped:
+        return
+    with write_connection() as conn:
+        for columns, rows in grouped.items():
+            assignments = ", ".join(f"{column}=excluded.{column}" for column in columns)
+            conn.executemany(
+                f"""
+                INSERT INTO claim_state (claim_id, {", ".join(columns)})
+                VALUES ({", ".join("?" for _ in range(len(columns) + 1))})
+                ON CONFLICT(claim_id) DO UPDATE SET {assignments}
+                """,
+                rows,
+            )
+
+
+def upsert_claim_state(claim_id: str, fields: Dict[str, Any]) -> None:
+    upsert_claim_states({claim_id: fields})
+
+
+def top_claims(order_by: str, limit: int = 10) -> List[Dict[str, Any]]:
+    if order_by not in SORTABLE_COLUMNS:
+        raise ValueError(f"cannot sort claims by {order_by}")
+    with read_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT claim_id, {", ".join(CLAIM_STATE_COLUMNS)} FROM claim_state
+            WHERE {order_by} IS NOT NULL
+            ORDER BY {order_by} DESC
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_claim_state(claim_id: str) -> Optional[Dict[str, Any]]:
+    with read_connection() as conn:
+        row = conn.execute(
+            f"SELECT claim_id, {', '.join(CLAIM_STATE_COLUMNS)} FROM claim_state WHERE claim_id = ?",
+            (claim_id,),
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def claim_state_summary(updated_since: str) -> Dict[str, int]:
+    with read_connection() as conn:
+        row = conn.execute(
+            """
+            SELECT
+                COUNT(*) AS total,
+                COALESCE(SUM(last_agent_update_ts >= ?), 0) AS updated_recent,
+                COALESCE(SUM(status = 'disputed'), 0) AS disputed,
+                COALESCE(SUM(alert_level = 'high'), 0) AS high_alerts
+            FROM claim_state
+            """,
+            (updated_since,),
+        ).fetchone()
+    return {key: int(row[key]) for key in row.keys()}
+
+
+def rebuild_claim_state(batch_size: int = 256) -> int:
+    with write_connection() as conn:
+        conn.execute("DELETE FROM claim_state")
+    rebuilt = 0
+    offset = None
+    while True:
+        points, next_offset = scroll_points(
+            CLAIMS_COLLECTION,
+            limit=batch_size,
+            offset=offset,
+            payload_fields=CLAIM_STATE_COLUMNS,
+        )
+        upsert_claim_states({str(point.id): point.payload or {} for point in points})
+        rebuilt += len(points)
+        if next_offset is None:
+            break
+        offset = next_offset
+    return rebuilt
+
+
+def main() -> None:
+    print(f"claim_state rebuilt from Qdrant: {rebuild_claim_state()} claims")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+from typing import Iterable, List, Tuple
+
+from core.utils import now_iso, uniq_list
+from storage.sqlite import read_connection, write_connection
+
+
+def mark_claims_dirty(claim_ids: Iterable[str], reason: str) -> None:
+    # Every path that changes a claim's evidence, confidence or links enqueues it
+    # here; the agent consumes the queue in seq order (see agents/orchestrator.py).
+    enqueued_ts = now_iso()
+    rows = [(claim_id, reason, enqueued_ts) for claim_id in uniq_list(map(str, claim_ids))]
+    if not rows:
+        return
+    with write_connection() as conn:
+        conn.executemany(
+            "INSERT INTO dirty_claims (claim_id, reason, enqueued_ts) VALUES (?, ?, ?)",
+            rows,
+        )
+
+
+def next_dirty_batch(after_seq: int, limit: int = 1000) -> Tuple[int, List[str]]:
+    # Returns the highest seq in the batch (the new cursor) and its distinct claim ids;
+    # a negative limit reads the whole pending queue.
+    with read_connection() as conn:
+        rows = conn.execute(
+            "SELECT seq, claim_id FROM dirty_claims WHERE seq > ? ORDER BY seq LIMIT ?",
+            (after_seq, limit),
+        ).fetchall()
+    if not rows:
+        return after_seq, []
+    return int(rows[-1]["seq"]), uniq_list(row["claim_id"] for row in rows)
+
+
+def ack_dirty_claims(upto_seq: int) -> None:
+    with write_connection() as conn:
+        conn.execute("DELETE FROM dirty_claims WHERE seq <= ?", (upto_seq,))
+
+
+def latest_dirty_seq() -> int:
+    with read_connection() as conn:
+        row = conn.execute("SELECT COALESCE(MAX(seq), 0) AS seq FROM dirty_claims").fetchone()
+    return int(row["seq"])
+
+
+def dirty_backlog(after_seq: int = 0) -> int:
+    with read_connection() as conn:
+        row = conn.execute(
+            "SELECT COUNT(DISTINCT claim_id) AS cnt FROM dirty_claims WHERE seq > ?",
+            (after_seq,),
+        ).fetchone()
+    return int(row["cnt"])
@@ -0,0 +1,174 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.utils import now_epoch
+from storage.sqlite import read_connection, write_connection
+
+
+JOB_KINDS = ("text", "meme")
+
+
+def enqueue_ingest_jobs(jobs: Iterable[Tuple[str, str, Optional[str]]], batch_id: str) -> int:
+    # jobs are (kind, path, source_name) triples; path must be readable by every
+    # worker process, source_name (the original filename) becomes the source id.
+    enqueued_ts = now_epoch()
+    rows = [
+        (kind, path, source_name, batch_id, enqueued_ts)
+        for kind, path, source_name in jobs
+        if kind in JOB_KINDS
+    ]
+    if not rows:
+        return 0
+    with write_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO ingest_jobs
+                (kind, path, source_name, batch_id, status, attempts, enqueued_ts)
+            VALUES (?, ?, ?, ?, 'queued', 0, ?)
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+def claim_ingest_jobs(
+    worker: str, limit: int, ttl_seconds: float, max_attempts: int
+) -> List[Dict[str, Any]]:
+    # One UPDATE marks the oldest queued jobs (and running jobs whose worker's
+    # lease lapsed) as ours, so concurrent workers never pick the same job. A
+    # lapsed job that already used max_attempts (its worker kept dying on it)
+    # is marked failed instead of being retried forever.
+    now = now_epoch()
+    with write_connection() as conn:
+        conn.execute(
+            """
+            UPDATE ingest_jobs
+            SET status = 'failed', finished_ts = ?,
+                error = COALESCE(error, 'worker lease expired')
+            WHERE status = 'running' AND lease_expires_ts < ? AND attempts >= ?
+            """,
+            (now, now, max_attempts),
+        )
+        conn.execute(
+            """
+            UPDATE ingest_jobs
+            SET status = 'running', worker = ?, started_ts = ?, lease_expires_ts = ?,
+                attempts = attempts + 1
+            WHERE job_id IN (
+                SELECT job_id FROM ingest_jobs
+                WHERE status = 'queued'
+                   OR (status = 'running' AND lease_expires_ts < ? AND attempts < ?)
+                ORDER BY job_id
+                LIMIT ?
+            )
+            """,
+            (worker, now, now + ttl_seconds, now, max_attempts, limit),
+        )
+        rows = conn.execute(
+            """
+            SELECT job_id, kind, path, source_name, attempts FROM ingest_jobs
+            WHERE status = 'running' AND worker = ?
+            ORDER BY job_id
+            """,
+            (worker,),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def renew_ingest_jobs(worker: str, ttl_seconds: float) -> None:
+    with write_connection() as conn:
+        conn.execute(
+            "UPDATE ingest_jobs SET lease_expires_ts = ? WHERE status = 'running' AND worker = ?",
+            (now_epoch() + ttl_seconds, worker),
+        )
+
+
+def finish_ingest_job(job_id: int, worker: str, result: Dict[str, Any]) -> None:
+    with write_connection() as conn:
+        conn.execute(
+            """
+            UPDATE ingest_jobs SET status = 'done', finished_ts = ?, result_json = ?, error = NULL
+            WHERE job_id = ? AND worker = ? AND status = 'running'
+            """,
+            (now_epoch(), json.dumps(result), job_id, worker),
+        )
+
+
+def fail_ingest_job(job_id: int, worker: str, error: str, max_attempts: int) -> None:
+    # Failed jobs go back to the queue until they have used max_attempts; only
+    # the terminal failure gets a finished_ts.
+    with write_connection() as conn:
+        conn.execute(
+            """
+            UPDATE ingest_jobs
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                finished_ts = CASE WHEN attempts >= ? THEN ? ELSE NULL END,
+                error = ?
+            WHERE job_id = ? AND worker = ? AND status = 'running'
+            """,
+            (max_attempts, max_attempts, now_epoch(), error, job_id, worker),
+        )
+
+
+def ingest_job_stats(batch_id: Optional[str] = None) -> Dict[str, Any]:
+    # Throughput is finished (done/failed) jobs over the time since the first of
+    # them started, up to now while work remains; the ETA extrapolates it over
+    # the jobs still queued or running.
+    where, params = ("WHERE batch_id = ?", (batch_id,)) if batch_id else ("", ())
+    finished_where = f"{where} {'AND' if where else 'WHERE'} status IN ('done', 'failed')"
+    with read_connection() as conn:
+        counts = {
+            row["status"]: int(row["cnt"])
+            for row in conn.execute(
+                f"SELECT status, COUNT(*) AS cnt FROM ingest_jobs {where} GROUP BY status",
+                params,
+            ).fetchall()
+        }
+        span = conn.execute(
+            f"""
+            SELECT MIN(started_ts) AS first_started, MAX(finished_ts) AS last_finished
+            FROM ingest_jobs {finished_where}
+            """,
+            params,
+        ).fetchone()
+    finished = counts.get("done", 0) + counts.get("failed", 0)
+    remaining = counts.get("queued", 0) + counts.get("running", 0)
+    throughput = 0.0
+    if finished and span["first_started"] is not None and span["last_finished"] is not None:
+        end = now_epoch() if remaining else span["last_finished"]
+        elapsed = max(end - span["first_started"], 1.0)
+        throughput = finished / elapsed
+    return {
+        "total": finished + remaining,
+        "queued": counts.get("queued", 0),
+        "running": counts.get("running", 0),
+        "done": counts.get("done", 0),
+        "failed": counts.get("failed", 0),
+        "jobs_per_minute": round(throughput * 60, 2),
+        "eta_seconds": round(remaining / throughput, 1) if throughput and remaining else None,
+    }
+
+
+def failed_ingest_jobs(batch_id: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    where, params = ("AND batch_id = ?", (batch_id,)) if batch_id else ("", ())
+    with read_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT job_id, kind, source_name, path, attempts, error FROM ingest_jobs
+            WHERE status = 'failed' {where}
+            ORDER BY job_id DESC
+            LIMIT ?
+            """,
+            (*params, limit),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def prune_ingest_jobs(retention_days: int) -> int:
+    cutoff = now_epoch() - retention_days * 86400
+    with write_connection() as conn:
+        cursor = conn.execute(
+            "DELETE FROM ingest_jobs WHERE status IN ('done', 'failed') AND finished_ts < ?",
+            (cutoff,),
+        )
+    return cursor.rowcount
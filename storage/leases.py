@@ -0,0 +1,82 @@
+import os
+import socket
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from core.utils import now_epoch
+from storage.sqlite import write_connection
+
+
+def lease_owner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire_lease(job_name: str, owner: str, ttl_seconds: float) -> bool:
+    # Takes the lease if it is free, expired, or already ours.
+    now = now_epoch()
+    with write_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO job_leases (job_name, owner, acquired_ts, heartbeat_ts, expires_ts)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(job_name) DO UPDATE SET
+                owner=excluded.owner,
+                acquired_ts=CASE WHEN job_leases.owner = excluded.owner
+                    THEN job_leases.acquired_ts ELSE excluded.acquired_ts END,
+                heartbeat_ts=excluded.heartbeat_ts,
+                expires_ts=excluded.expires_ts
+            WHERE job_leases.owner = excluded.owner OR job_leases.expires_ts < excluded.heartbeat_ts
+            """,
+            (job_name, owner, now, now, now + ttl_seconds),
+        )
+        row = conn.execute(
+            "SELECT owner FROM job_leases WHERE job_name = ?", (job_name,)
+        ).fetchone()
+    return bool(row) and row["owner"] == owner
+
+
+def heartbeat_lease(job_name: str, owner: str, ttl_seconds: float) -> bool:
+    now = now_epoch()
+    with write_connection() as conn:
+        cursor = conn.execute(
+            """
+            UPDATE job_leases SET heartbeat_ts = ?, expires_ts = ?
+            WHERE job_name = ? AND owner = ?
+            """,
+            (now, now + ttl_seconds, job_name, owner),
+        )
+    return cursor.rowcount > 0
+
+
+def release_lease(job_name: str, owner: str) -> None:
+    with write_connection() as conn:
+        conn.execute("DELETE FROM job_leases WHERE job_name = ? AND owner = ?", (job_name, owner))
+
+
+@contextmanager
+def held_lease(
+    job_name: str, ttl_seconds: float, owner: Optional[str] = None
+) -> Iterator[bool]:
+    # Yields False without running anything when another owner holds a live lease.
+    # While held, a daemon thread renews it every ttl/3 so long jobs keep it.
+    owner = owner or lease_owner_id()
+    if not acquire_lease(job_name, owner, ttl_seconds):
+        yield False
+        return
+    stop = threading.Event()
+
+    def renew() -> None:
+        while not stop.wait(ttl_seconds / 3):
+            if not heartbeat_lease(job_name, owner, ttl_seconds):
+                break
+
+    heartbeat = threading.Thread(target=renew, name=f"lease-{job_name}", daemon=True)
+    heartbeat.start()
+    try:
+        yield True
+    finally:
+        stop.set()
+        heartbeat.join()
+        release_lease(job_name, owner)
@@ -0,0 +1,330 @@
+import sqlite3
+from typing import Callable, List, Tuple
+
+from core.utils import now_iso
+
+
+def _ensure_column(conn: sqlite3.Connection, table: str, column: str, column_type: str) -> None:
+    cursor = conn.execute(f"PRAGMA table_info({table})")
+    columns = [row["name"] for row in cursor.fetchall()]
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+
+def _baseline_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sources (
+            source_id TEXT PRIMARY KEY,
+            source_type TEXT,
+            title TEXT,
+            timestamp TEXT,
+            url TEXT,
+            text_hash TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS claim_links (
+            source_id TEXT,
+            claim_id TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            timestamp TEXT,
+            claim_id TEXT,
+            event_type TEXT,
+            delta REAL,
+            reason TEXT,
+            source_id TEXT,
+            agent_name TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS agent_state (
+            agent_name TEXT PRIMARY KEY,
+            last_run_ts TEXT,
+            cursor TEXT,
+            extra_json TEXT
+        )
+        """
+    )
+    _ensure_column(conn, "events", "agent_name", "TEXT")
+
+
+def _claim_link_and_event_indexes(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        DELETE FROM claim_links
+        WHERE rowid NOT IN (
+            SELECT MIN(rowid) FROM claim_links GROUP BY source_id, claim_id
+        )
+        """
+    )
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_claim_links_source_claim "
+        "ON claim_links (source_id, claim_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_claim_links_claim ON claim_links (claim_id, source_id)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_sources_timestamp ON sources (timestamp)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_events_claim_type_ts "
+        "ON events (claim_id, event_type, timestamp)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_events_timestamp ON events (timestamp)")
+
+
+def _event_rollups(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS event_rollups (
+            day TEXT,
+            claim_id TEXT,
+            event_type TEXT,
+            event_count INTEGER,
+            delta_sum REAL,
+            PRIMARY KEY (claim_id, event_type, day)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_event_rollups_day ON event_rollups (day)")
+
+
+def _claim_state_mirror(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS claim_state (
+            claim_id TEXT PRIMARY KEY,
+            claim_text TEXT,
+            status TEXT,
+            confidence REAL,
+            trend_score REAL,
+            contradiction_ratio REAL,
+            volatility_score REAL,
+            meme_variant_count INTEGER,
+            alert_level TEXT,
+            mention_count INTEGER,
+            support_count INTEGER,
+            contradict_count INTEGER,
+            last_seen_ts TEXT,
+            last_agent_update_ts TEXT
+        )
+        """
+    )
+    for column in (
+        "trend_score",
+        "contradiction_ratio",
+        "volatility_score",
+        "confidence",
+        "alert_level",
+        "status",
+        "last_agent_update_ts",
+    ):
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_claim_state_{column} ON claim_state ({column})"
+        )
+
+
+def _dirty_claims_queue(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dirty_claims (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            claim_id TEXT NOT NULL,
+            reason TEXT,
+            enqueued_ts TEXT
+        )
+        """
+    )
+    # Seed the queue with what the old source-timestamp scan would have picked up next.
+    conn.execute(
+        """
+        INSERT INTO dirty_claims (claim_id, reason, enqueued_ts)
+        SELECT DISTINCT claim_links.claim_id, 'migration', ?
+        FROM claim_links
+        JOIN sources ON sources.source_id = claim_links.source_id
+        WHERE sources.timestamp > COALESCE(
+            (SELECT last_run_ts FROM agent_state WHERE agent_name = 'claim_evolution'), ''
+        )
+        """,
+        (now_iso(),),
+    )
+
+
+def _job_leases(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_leases (
+            job_name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            acquired_ts REAL,
+            heartbeat_ts REAL,
+            expires_ts REAL
+        )
+        """
+    )
+
+
+def _claim_mention_buckets(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS claim_mention_buckets (
+            claim_id TEXT,
+            day TEXT,
+            mentions INTEGER,
+            PRIMARY KEY (claim_id, day)
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_claim_mention_buckets_day ON claim_mention_buckets (day)"
+    )
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO claim_mention_buckets (claim_id, day, mentions)
+        SELECT claim_links.claim_id, substr(sources.timestamp, 1, 10), COUNT(DISTINCT sources.source_id)
+        FROM claim_links
+        JOIN sources ON sources.source_id = claim_links.source_id
+        WHERE sources.timestamp IS NOT NULL
+        GROUP BY claim_links.claim_id, substr(sources.timestamp, 1, 10)
+        """
+    )
+    _ensure_column(conn, "claim_state", "trend_1d", "REAL")
+    _ensure_column(conn, "claim_state", "trend_30d", "REAL")
+
+
+def _agent_runs(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS agent_runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            agent_name TEXT,
+            mode TEXT,
+            started_ts TEXT,
+            finished_ts TEXT,
+            duration_seconds REAL,
+            claims_processed INTEGER,
+            summary_json TEXT,
+            telemetry_json TEXT
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_agent_runs_agent_started ON agent_runs (agent_name, started_ts)"
+    )
+
+
+def _query_cache(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS corpus_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            updated_ts TEXT
+        )
+        """
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO corpus_version (id, version, updated_ts) VALUES (1, 1, ?)",
+        (now_iso(),),
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS query_cache (
+            query_key TEXT PRIMARY KEY,
+            corpus_version INTEGER NOT NULL,
+            result_json TEXT,
+            created_ts TEXT
+        )
+        """
+    )
+
+
+def _ingest_jobs(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_jobs (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            path TEXT NOT NULL,
+            batch_id TEXT,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            enqueued_ts REAL,
+            started_ts REAL,
+            finished_ts REAL,
+            lease_expires_ts REAL,
+            result_json TEXT,
+            error TEXT
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_ingest_jobs_status ON ingest_jobs (status, job_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_ingest_jobs_batch ON ingest_jobs (batch_id)")
+
+
+def _query_cache_created_index(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_query_cache_created ON query_cache(created_ts)")
+
+
+def _ingest_job_source_name(conn: sqlite3.Connection) -> None:
+    _ensure_column(conn, "ingest_jobs", "source_name", "TEXT")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "baseline tables", _baseline_tables),
+    (2, "claim_links uniqueness, claim/source/event indexes", _claim_link_and_event_indexes),
+    (3, "daily per-claim event rollups", _event_rollups),
+    (4, "claim_state mirror of claim payloads", _claim_state_mirror),
+    (5, "dirty_claims change queue", _dirty_claims_queue),
+    (6, "job_leases for scheduler coordination", _job_leases),
+    (7, "per-claim daily mention buckets", _claim_mention_buckets),
+    (8, "agent_runs telemetry history", _agent_runs),
+    (9, "corpus_version counter and query_cache", _query_cache),
+    (10, "ingest_jobs background ingestion queue", _ingest_jobs),
+    (11, "query_cache created_ts index for size-capped eviction", _query_cache_created_index),
+    (12, "ingest_jobs source_name (original upload filename)", _ingest_job_source_name),
+]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_ts TEXT
+        )
+        """
+    )
+    conn.commit()
+    current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            applied = conn.execute(
+                "SELECT 1 FROM schema_version WHERE version = ?", (version,)
+            ).fetchone()
+            if applied:
+                conn.rollback()
+                continue
+            migrate(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_ts) VALUES (?, ?, ?)",
+                (version, description, now_iso()),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
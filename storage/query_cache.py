@@ -0,0 +1,98 @@
+import json
+from typing import Any, Dict, Iterable
+
+from core.config import settings
+from core.utils import clean_text, now_iso
+from storage.sqlite import read_connection, temp_id_table, write_connection
+
+
+def normalize_query(text: str) -> str:
+    return clean_text(text or "").lower()
+
+
+def corpus_version() -> int:
+    with read_connection() as conn:
+        row = conn.execute("SELECT version FROM corpus_version WHERE id = 1").fetchone()
+    return int(row["version"]) if row else 0
+
+
+def bump_corpus_version() -> None:
+    # Called after anything that can change retrieval results (ingest, decay,
+    # stance relabels, reset); cached entries from older versions stop matching.
+    with write_connection() as conn:
+        conn.execute(
+            "UPDATE corpus_version SET version = version + 1, updated_ts = ? WHERE id = 1",
+            (now_iso(),),
+        )
+
+
+def get_cached_results(queries: Iterable[str], version: int) -> Dict[str, Any]:
+    # Keyed by normalize_query(); only entries written at `version` are returned.
+    keys = list(dict.fromkeys(normalize_query(query) for query in queries))
+    if not keys:
+        return {}
+    with read_connection() as conn, temp_id_table(conn, keys, "cache_query_keys") as ids:
+        rows = conn.execute(
+            f"""
+            SELECT query_cache.query_key, query_cache.result_json
+            FROM {ids} AS ids
+            JOIN query_cache ON query_cache.query_key = ids.id
+            WHERE query_cache.corpus_version = ?
+            """,
+            (version,),
+        ).fetchall()
+    return {row["query_key"]: json.loads(row["result_json"]) for row in rows}
+
+
+def put_cached_results(results: Dict[str, Any], version: int) -> None:
+    # `version` must be read before the results were computed, so a result that
+    # raced with an ingest is stored under the old version and never served.
+    created_ts = now_iso()
+    rows = [
+        (normalize_query(query), version, json.dumps(result, default=str), created_ts)
+        for query, result in results.items()
+    ]
+    if not rows:
+        return
+    with write_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO query_cache (query_key, corpus_version, result_json, created_ts)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(query_key) DO UPDATE SET
+                corpus_version = excluded.corpus_version,
+                result_json = excluded.result_json,
+                created_ts = excluded.created_ts
+            WHERE excluded.corpus_version >= query_cache.corpus_version
+            """,
+            rows,
+        )
+        _evict_oldest(conn, settings.query_cache_max_entries)
+
+
+def _evict_oldest(conn, max_entries: int) -> int:
+    # Keeps the newest max_entries rows by created_ts (0 disables the cap). Run
+    # on every write, so distinct queries within one corpus version cannot grow
+    # the table past the cap between compaction runs.
+    if max_entries <= 0:
+        return 0
+    cursor = conn.execute(
+        """
+        DELETE FROM query_cache WHERE query_key IN (
+            SELECT query_key FROM query_cache
+            ORDER BY created_ts DESC
+            LIMIT -1 OFFSET ?
+        )
+        """,
+        (max_entries,),
+    )
+    return cursor.rowcount
+
+
+def prune_query_cache() -> int:
+    with write_connection() as conn:
+        cursor = conn.execute(
+            "DELETE FROM query_cache WHERE corpus_version < "
+            "(SELECT version FROM corpus_version WHERE id = 1)"
+        )
+        return cursor.rowcount + _evict_oldest(conn, settings.query_cache_max_entries)
@@ -1,78 +1,102 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
 from core.config import settings
+from core.utils import now_iso
+from storage.migrations import apply_migrations
 
 
 _connection = None
+_write_lock = threading.RLock()
+_local = threading.local()
 
 
 def get_connection() -> sqlite3.Connection:
+    # The single writer connection; use write_connection()/read_connection()
+    # scopes rather than sharing it directly across threads.
     global _connection
-    if _connection is None:
-        _connection = sqlite3.connect(settings.sqlite_path, check_same_thread=False)
-        _connection.row_factory = sqlite3.Row
-        _init_db(_connection)
+    with _write_lock:
+        if _connection is None:
+            conn = sqlite3.connect(settings.sqlite_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            _init_db(conn)
+            _connection = conn
     return _connection
 
 
 def _init_db(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS sources (
-            source_id TEXT PRIMARY KEY,
-            source_type TEXT,
-            title TEXT,
-            timestamp TEXT,
-            url TEXT,
-            text_hash TEXT
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS claim_links (
-            source_id TEXT,
-            claim_id TEXT
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS events (
-            timestamp TEXT,
-            claim_id TEXT,
-            event_type TEXT,
-            delta REAL,
-            reason TEXT,
-            source_id TEXT,
-            agent_name TEXT
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS agent_state (
-            agent_name TEXT PRIMARY KEY,
-            last_run_ts TEXT,
-            cursor TEXT,
-            extra_json TEXT
-        )
-        """
-    )
-    _ensure_column(conn, "events", "agent_name", "TEXT")
-    conn.commit()
+    apply_migrations(conn)
+
+
+@contextmanager
+def write_connection() -> Iterator[sqlite3.Connection]:
+    conn = get_connection()
+    with _write_lock:
+        depth = getattr(_local, "write_depth", 0)
+        _local.write_depth = depth + 1
+        try:
+            if depth:
+                yield conn
+            else:
+                with conn:
+                    yield conn
+        finally:
+            _local.write_depth = depth
+
+
+def _open_reader() -> sqlite3.Connection:
+    get_connection()
+    uri = Path(settings.sqlite_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
 
+@contextmanager
+def read_connection() -> Iterator[sqlite3.Connection]:
+    conn = getattr(_local, "reader", None)
+    if conn is None:
+        conn = _open_reader()
+        _local.reader = conn
+    yield conn
 
-def _ensure_column(conn: sqlite3.Connection, table: str, column: str, column_type: str) -> None:
-    cursor = conn.execute(f"PRAGMA table_info({table})")
-    columns = [row["name"] for row in cursor.fetchall()]
-    if column not in columns:
-        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+@contextmanager
+def temp_id_table(
+    conn: sqlite3.Connection, ids: Iterable[str], table: str = "temp_ids"
+) -> Iterator[str]:
+    # Loads ids into a connection-local temp table so set-based queries can JOIN
+    # against it; works on read-only connections too. Commits right away so the
+    # reader does not keep a snapshot open between queries.
+    conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY)")
+    conn.execute(f"DELETE FROM temp.{table}")
+    conn.executemany(f"INSERT OR IGNORE INTO temp.{table} (id) VALUES (?)", ((i,) for i in ids))
+    conn.commit()
+    try:
+        yield f"temp.{table}"
+    finally:
+        conn.execute(f"DELETE FROM temp.{table}")
+        conn.commit()
 
 
 def reset_db() -> None:
-    conn = get_connection()
-    with conn:
+    with write_connection() as conn:
         conn.execute("DELETE FROM claim_links")
         conn.execute("DELETE FROM events")
+        conn.execute("DELETE FROM event_rollups")
         conn.execute("DELETE FROM sources")
         conn.execute("DELETE FROM agent_state")
+        conn.execute("DELETE FROM claim_state")
+        conn.execute("DELETE FROM dirty_claims")
+        conn.execute("DELETE FROM claim_mention_buckets")
+        conn.execute("DELETE FROM agent_runs")
+        conn.execute("DELETE FROM query_cache")
+        conn.execute("DELETE FROM ingest_jobs")
+        conn.execute(
+            "UPDATE corpus_version SET version = version + 1, updated_ts = ?", (now_iso(),)
+        )
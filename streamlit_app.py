@@ -1,6 +1,6 @@
 import io
 import os
-import tempfile
+import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List
 
@@ -10,17 +10,10 @@ import streamlit as st
 import requests
 
 from agents.orchestrator import run_claim_evolution_agent
-from agents.utils import parse_iso
 from core.config import settings
-from core.utils import clean_text
-from ingestion.ingest_meme import ingest_meme
-from ingestion.ingest_text import ingest_text
 from memory.decay import apply_decay
-from models.image_embedder import get_image_embedder
+from memory.events import flush_events
 from models.llm_reasoner import generate_deduction
-from models.ocr import extract_text
-from models.stance_classifier import classify_stance_with_scores
-from models.text_embedder import get_text_embedder
 from qdrant_store.collections import (
     CLAIMS_COLLECTION,
     EVIDENCE_COLLECTION,
@@ -29,8 +22,13 @@ from qdrant_store.collections import (
     reset_collections,
 )
 from qdrant_store.client import get_client
-from qdrant_store.crud import search_vectors, scroll_points
-from storage.sqlite import get_connection, reset_db
+from retrieval.meme import analyze_meme, meme_hit_rows
+from retrieval.service import retrieve_by_claim_text
+from storage.agent_runs import recent_agent_runs
+from storage.claim_state import claim_state_summary, rebuild_claim_state, top_claims
+from storage.files import save_uploaded_file
+from storage.ingest_jobs import enqueue_ingest_jobs, failed_ingest_jobs, ingest_job_stats
+from storage.sqlite import read_connection, reset_db
 
 
 # --------------------------------------------------
@@ -44,19 +42,6 @@ st.set_page_config(
 ensure_collections()
 
 
-# --------------------------------------------------
-# Cached models
-# --------------------------------------------------
-@st.cache_resource
-def _get_text_embedder():
-    return get_text_embedder()
-
-
-@st.cache_resource
-def _get_image_embedder():
-    return get_image_embedder()
-
-
 # --------------------------------------------------
 # Corpus status
 # --------------------------------------------------
@@ -81,40 +66,31 @@ def show_corpus_status():
 # --------------------------------------------------
 # Agent insights helpers
 # --------------------------------------------------
-def _is_recent(ts: str, hours: int = 24) -> bool:
-    dt = parse_iso(ts)
-    if not dt:
-        return False
-    return dt >= datetime.utcnow() - timedelta(hours=hours)
-
-
-def _load_claim_payloads() -> List[Dict[str, object]]:
-    rows: List[Dict[str, object]] = []
-    offset = None
-    while True:
-        points, next_offset = scroll_points(CLAIMS_COLLECTION, limit=100, offset=offset)
-        for point in points:
-            payload = point.payload or {}
-            payload["claim_id"] = payload.get("canonical_claim_id", point.id)
-            rows.append(payload)
-        if next_offset is None:
-            break
-        offset = next_offset
-    return rows
+def _hours_ago_iso(hours: int) -> str:
+    return (datetime.utcnow() - timedelta(hours=hours)).isoformat() + "Z"
+
+
+def _ensure_claim_state() -> Dict[str, int]:
+    summary = claim_state_summary(_hours_ago_iso(24))
+    if summary["total"] == 0 and get_collection_counts()[CLAIMS_COLLECTION] > 0:
+        rebuild_claim_state()
+        summary = claim_state_summary(_hours_ago_iso(24))
+    return summary
 
 
 def _get_recent_agent_events(limit: int = 50) -> List[Dict[str, object]]:
-    conn = get_connection()
-    rows = conn.execute(
-        """
-        SELECT timestamp, claim_id, event_type, delta, reason, source_id, agent_name
-        FROM events
-        WHERE agent_name IS NOT NULL OR event_type LIKE 'agent_%'
-        ORDER BY timestamp DESC
-        LIMIT ?
-        """,
-        (limit,),
-    ).fetchall()
+    flush_events()
+    with read_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT timestamp, claim_id, event_type, delta, reason, source_id, agent_name
+            FROM events
+            WHERE agent_name IS NOT NULL OR event_type LIKE 'agent_%'
+            ORDER BY timestamp DESC
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
     return [dict(row) for row in rows]
 
 
@@ -179,122 +155,37 @@ def _test_ollama_generate() -> Dict[str, object]:
 
 
 # --------------------------------------------------
-# Verdict helpers
+# Ingest helpers
 # --------------------------------------------------
-def _init_verdict():
-    return {
-        "support_count": 0,
-        "contradict_count": 0,
-        "mention_count": 0,
-        "support_score": 0.0,
-        "contradict_score": 0.0,
-        "mention_score": 0.0,
-    }
-
+def _format_eta(seconds) -> str:
+    if seconds is None:
+        return "—"
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}m {secs}s" if minutes else f"{secs}s"
 
-def _update_verdict(stats, stance, scores):
-    stats[f"{stance}_count"] += 1
-    for k in ["support", "contradict", "mention"]:
-        stats[f"{k}_score"] += scores.get(k, 0.0)
 
-
-def _finalize_verdict(stats):
-    s, c = stats["support_count"], stats["contradict_count"]
-
-    if s + c < 2:
-        label = "Inconclusive"
-    elif c > s:
-        label = "False (corpus-contradicted)"
-    elif s > c:
-        label = "True (corpus-supported)"
-    else:
-        label = "Mixed"
-
-    stats["label"] = label
-    return stats
-
-
-# --------------------------------------------------
-# Evidence handling
-# --------------------------------------------------
-def _push_evidence(ev, query, evidence, verdict, seen):
-    payload = ev.payload or {}
-    eid = str(payload.get("evidence_id", ev.id))
-    if eid in seen:
+@st.fragment(run_every=settings.ingest_poll_seconds)
+def _show_ingest_progress(batch_id):
+    # Jobs run in `python -m ingestion.worker`; this only polls their status.
+    if not batch_id:
         return
-
-    seen.add(eid)
-    snippet = payload.get("snippet_text", "")
-    stance, scores = classify_stance_with_scores(snippet, query)
-    _update_verdict(verdict, stance, scores)
-
-    evidence[stance].append(
-        {
-            "evidence_id": eid,
-            "snippet_text": snippet,
-            "source_id": payload.get("source_id", ""),
-            "score": round(ev.score, 4),
-            "stance_score": round(scores.get(stance, 0.0), 4),
-        }
-    )
-
-
-def _truncate_text(text: str, limit: int = 160) -> str:
-    cleaned = clean_text(text or "")
-    if len(cleaned) <= limit:
-        return cleaned
-    return f"{cleaned[:limit]}..."
-
-
-def _meme_hit_rows(hits):
-    rows = []
-    for hit in hits:
-        payload = hit.payload or {}
-        rows.append(
-            {
-                "media_id": payload.get("media_id", str(hit.id)),
-                "score": round(hit.score, 4),
-                "phash": payload.get("phash", ""),
-                "timestamp": payload.get("timestamp", ""),
-                "ocr_preview": _truncate_text(payload.get("ocr_text", "")),
-                "linked_claim_ids": payload.get("linked_claim_ids", []),
-                "source_id": payload.get("source_id", ""),
-            }
-        )
-    return rows
-
-
-def retrieve_by_claim_text(query: str):
-    embedder = _get_text_embedder()
-    vector = embedder.embed([query])[0].tolist()
-
-    claim_hits = search_vectors(CLAIMS_COLLECTION, "text_dense", vector, limit=5)
-
-    evidence = {"support": [], "contradict": [], "mention": []}
-    verdict = _init_verdict()
-    seen = set()
-
-    claim_rows = []
-    for hit in claim_hits:
-        payload = hit.payload or {}
-        cid = payload.get("canonical_claim_id", hit.id)
-        claim_rows.append(
-            {
-                "claim_id": cid,
-                "claim_text": payload.get("claim_text", ""),
-                "score": round(hit.score, 4),
-            }
-        )
-
-        filters = {"must": [{"key": "claim_id", "match": {"value": cid}}]}
-        ev_hits = search_vectors(
-            EVIDENCE_COLLECTION, "snippet_dense", vector, limit=20, filters=filters
-        )
-
-        for ev in ev_hits:
-            _push_evidence(ev, query, evidence, verdict, seen)
-
-    return claim_rows, evidence, _finalize_verdict(verdict)
+    stats = ingest_job_stats(batch_id)
+    if not stats["total"]:
+        return
+    st.subheader("Ingestion progress")
+    finished = stats["done"] + stats["failed"]
+    st.progress(finished / stats["total"], text=f"{finished}/{stats['total']} files processed")
+    cols = st.columns(5)
+    cols[0].metric("Queued", stats["queued"])
+    cols[1].metric("Running", stats["running"])
+    cols[2].metric("Done", stats["done"])
+    cols[3].metric("Files / min", stats["jobs_per_minute"])
+    cols[4].metric("ETA", _format_eta(stats["eta_seconds"]))
+    if stats["queued"] and not stats["running"] and not finished:
+        st.caption("Waiting for a worker. Start one with `python -m ingestion.worker`.")
+    if stats["failed"]:
+        st.warning(f"{stats['failed']} files failed after {settings.ingest_max_attempts} attempts.")
+        st.dataframe(pd.DataFrame(failed_ingest_jobs(batch_id)))
 
 
 # --------------------------------------------------
@@ -371,17 +262,10 @@ elif page == "Analyze Meme":
 
         if analyze:
             with st.spinner("Extracting text and searching for matches..."):
-                ocr_text = clean_text(extract_text(image))
-                image_vector = _get_image_embedder().embed([image])[0].tolist()
-                image_hits = search_vectors(
-                    MEDIA_COLLECTION, "image_dense", image_vector, limit=5
-                )
-                text_hits = []
-                if ocr_text:
-                    text_vector = _get_text_embedder().embed([ocr_text])[0].tolist()
-                    text_hits = search_vectors(
-                        MEDIA_COLLECTION, "ocr_text_dense", text_vector, limit=5
-                    )
+                analysis = analyze_meme(image)
+            ocr_text = analysis["ocr_text"]
+            image_hits = analysis["image_hits"]
+            text_hits = analysis["text_hits"]
 
             st.subheader("OCR Text")
             if ocr_text:
@@ -391,22 +275,21 @@ elif page == "Analyze Meme":
 
             st.subheader("Similar Memes (Image)")
             if image_hits:
-                st.dataframe(pd.DataFrame(_meme_hit_rows(image_hits)))
+                st.dataframe(pd.DataFrame(meme_hit_rows(image_hits)))
             else:
                 st.info("No similar memes found using image similarity.")
 
             st.subheader("Similar Memes (OCR Text)")
             if ocr_text:
                 if text_hits:
-                    st.dataframe(pd.DataFrame(_meme_hit_rows(text_hits)))
+                    st.dataframe(pd.DataFrame(meme_hit_rows(text_hits)))
                 else:
                     st.info("No similar memes found using OCR text similarity.")
             else:
                 st.caption("OCR text is empty; skipping OCR similarity search.")
 
             if ocr_text:
-                with st.spinner("Matching OCR text against claims..."):
-                    claims, evidence, verdict = retrieve_by_claim_text(ocr_text)
+                claims, evidence, verdict = analysis["claim_result"]
 
                 st.subheader("Verdict (OCR Text)")
                 st.markdown(f"### 🧠 {verdict['label']}")
@@ -427,6 +310,13 @@ elif page == "Analyze Meme":
             else:
                 st.caption("OCR text is empty; skipping claim matching.")
 
+            with st.expander("Trace"):
+                st.caption(
+                    f"End-to-end: {analysis['total_ms']:.0f} ms — OCR and image branches "
+                    "run concurrently; claim retrieval and OCR search start once OCR text exists."
+                )
+                st.dataframe(pd.DataFrame(analysis["trace"]))
+
 
 # --------------------------------------------------
 # Agent Insights
@@ -457,40 +347,42 @@ elif page == "Agent Insights":
     if st.button("Run Agent Now"):
         with st.spinner("Running claim evolution agent..."):
             summary = run_claim_evolution_agent(force_full_scan=False)
-        st.success(
-            f"Agent run complete — updated {summary.get('claims_updated', 0)} claims, "
-            f"high alerts {summary.get('high_alerts', 0)}"
-        )
+        if summary.get("skipped"):
+            st.info("Another agent run is in progress; it will pick up the queued claims.")
+        else:
+            st.success(
+                f"Agent run complete — updated {summary.get('claims_updated', 0)} claims, "
+                f"high alerts {summary.get('high_alerts', 0)}"
+            )
 
-    claims = _load_claim_payloads()
-    if not claims:
+    if st.button("Rebuild claim table from Qdrant"):
+        with st.spinner("Rebuilding claim table..."):
+            rebuilt = rebuild_claim_state()
+        st.success(f"Claim table rebuilt — {rebuilt} claims")
+
+    claim_summary = _ensure_claim_state()
+    if not claim_summary["total"]:
         st.info("No claims available yet. Ingest content to see agent insights.")
     else:
-        updated_recent = sum(
-            1 for claim in claims if _is_recent(str(claim.get("last_agent_update_ts", "")))
-        )
-        disputed = sum(1 for claim in claims if claim.get("status") == "disputed")
-        high_alerts = sum(1 for claim in claims if claim.get("alert_level") == "high")
-
         st.subheader("Agent Summary Metrics")
         col1, col2, col3 = st.columns(3)
-        col1.metric("Claims Updated (24h)", updated_recent)
-        col2.metric("Disputed Claims", disputed)
-        col3.metric("High Alerts", high_alerts)
+        col1.metric("Claims Updated (24h)", claim_summary["updated_recent"])
+        col2.metric("Disputed Claims", claim_summary["disputed"])
+        col3.metric("High Alerts", claim_summary["high_alerts"])
 
         st.subheader("Trending Claims")
-        trend_rows = sorted(
-            claims, key=lambda c: float(c.get("trend_score", 0.0)), reverse=True
-        )[:10]
+        trend_rows = top_claims("trend_score", limit=10)
         st.dataframe(
             pd.DataFrame(
                 [
                     {
                         "claim_id": row.get("claim_id"),
                         "claim_text": row.get("claim_text"),
-                        "trend_score": row.get("trend_score", 0.0),
-                        "contradiction_ratio": row.get("contradiction_ratio", 0.0),
-                        "alert_level": row.get("alert_level", "low"),
+                        "trend_1d": row.get("trend_1d") or 0.0,
+                        "trend_7d": row.get("trend_score") or 0.0,
+                        "trend_30d": row.get("trend_30d") or 0.0,
+                        "contradiction_ratio": row.get("contradiction_ratio") or 0.0,
+                        "alert_level": row.get("alert_level") or "low",
                     }
                     for row in trend_rows
                 ]
@@ -498,23 +390,50 @@ elif page == "Agent Insights":
         )
 
         st.subheader("Disputed Claims")
-        dispute_rows = sorted(
-            claims, key=lambda c: float(c.get("contradiction_ratio", 0.0)), reverse=True
-        )[:10]
+        dispute_rows = top_claims("contradiction_ratio", limit=10)
         st.dataframe(
             pd.DataFrame(
                 [
                     {
                         "claim_id": row.get("claim_id"),
                         "claim_text": row.get("claim_text"),
-                        "contradiction_ratio": row.get("contradiction_ratio", 0.0),
-                        "alert_level": row.get("alert_level", "low"),
+                        "contradiction_ratio": row.get("contradiction_ratio") or 0.0,
+                        "alert_level": row.get("alert_level") or "low",
                     }
                     for row in dispute_rows
                 ]
             )
         )
 
+        st.subheader("Agent Run Telemetry")
+        runs = recent_agent_runs("claim_evolution", limit=50)
+        if runs:
+            timeline = pd.DataFrame(
+                [
+                    {"started_ts": run["started_ts"], **run["telemetry"].get("phases", {})}
+                    for run in runs
+                ]
+            ).set_index("started_ts")
+            st.caption("Seconds per phase (summed over worker threads)")
+            st.line_chart(timeline.fillna(0.0))
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {
+                            "started_ts": run["started_ts"],
+                            "mode": run["mode"],
+                            "duration_seconds": run["duration_seconds"],
+                            "claims_processed": run["claims_processed"],
+                            "claims_per_second": run["telemetry"].get("claims_per_second"),
+                            **run["telemetry"].get("counters", {}),
+                        }
+                        for run in reversed(runs)
+                    ]
+                )
+            )
+        else:
+            st.caption("No agent runs recorded yet.")
+
         st.subheader("Recent Agent Events")
         events = _get_recent_agent_events()
         if events:
@@ -524,9 +443,9 @@ elif page == "Agent Insights":
 
         st.subheader("Explainability Panel")
         option_map = {}
-        for row in claims:
+        for row in top_claims("last_agent_update_ts", limit=200) + trend_rows + dispute_rows:
             claim_id = str(row.get("claim_id"))
-            label = f"{row.get('claim_text', '')[:60]}... ({claim_id})"
+            label = f"{(row.get('claim_text') or '')[:60]}... ({claim_id})"
             option_map[label] = row
         selected = st.selectbox("Select a claim", list(option_map.keys()))
         selected_claim = option_map.get(selected)
@@ -535,6 +454,8 @@ elif page == "Agent Insights":
                 {
                     "claim_text": selected_claim.get("claim_text"),
                     "trend_score": selected_claim.get("trend_score"),
+                    "trend_1d": selected_claim.get("trend_1d"),
+                    "trend_30d": selected_claim.get("trend_30d"),
                     "contradiction_ratio": selected_claim.get("contradiction_ratio"),
                     "support_count": selected_claim.get("support_count"),
                     "contradict_count": selected_claim.get("contradict_count"),
@@ -557,23 +478,24 @@ elif page == "Ingest Corpus":
     texts = st.file_uploader("Upload Text Files", ["txt"], accept_multiple_files=True)
 
     if st.button("Ingest"):
-        temp_dir = tempfile.gettempdir()
-        for f in texts or []:
-            path = os.path.join(temp_dir, f.name)
-            with open(path, "wb") as out:
-                out.write(f.read())
-            ingest_text(path)
-
-        for f in memes or []:
-            path = os.path.join(temp_dir, f.name)
-            with open(path, "wb") as out:
-                out.write(f.read())
-            ingest_meme(path)
+        jobs = [("text", save_uploaded_file(f, ".txt"), f.name) for f in texts or []]
+        jobs += [
+            ("meme", save_uploaded_file(f, os.path.splitext(f.name)[1].lower()), f.name)
+            for f in memes or []
+        ]
+        batch_id = uuid.uuid4().hex
+        queued = enqueue_ingest_jobs(jobs, batch_id)
+        if queued:
+            st.session_state["ingest_batch_id"] = batch_id
+            st.success(f"Queued {queued} files for ingestion.")
+        else:
+            st.warning("Select files to ingest.")
 
-        st.success("Ingestion completed")
+    _show_ingest_progress(st.session_state.get("ingest_batch_id"))
 
     if st.button("Run decay"):
         updated = apply_decay()
+        flush_events()
         st.info(f"Decay applied to {updated} claims")
 
     st.divider()
@@ -583,5 +505,6 @@ elif page == "Ingest Corpus":
     if st.button("Remove all corpus data", type="primary", disabled=not confirm_clear):
         with st.spinner("Clearing corpus..."):
             reset_collections()
+            flush_events()
             reset_db()
         st.success("Corpus cleared.")